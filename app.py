@@ -1,15 +1,61 @@
+import asyncio
+import hashlib
+import json
+import tempfile
+from functools import partial
+import time
 from fastapi import FastAPI, Request
 from typing import Optional
 from uvicorn import run as app_run
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from car_price.utils.main_utils import MainUtils
 
-from car_price.components.model_predictor import CarPricePredictor, CarData
-from car_price.constant import APP_HOST, APP_PORT
-from car_price.pipeline.train_pipeline import TrainPipeline
+from car_price.components.admission_controller import AdmissionController
+from car_price.components.arrow_scorer import ARROW_STREAM_MEDIA_TYPE, ArrowScorer
+from car_price.components.micro_batcher import MicroBatcher
+from car_price.components.model_cache import ModelCache
+from car_price.components.model_warmer import ModelWarmer
+from car_price.components.prediction_cache import PredictionCache
+from car_price.components.request_coalescer import RequestCoalescer
+from car_price.components.stream_scorer import StreamScorer
+from car_price.configuration.client_registry import close_clients
+from car_price.components.model_predictor import (
+    CarBatchData,
+    CarData,
+    CarPricePredictor,
+)
+from car_price.constant import (
+    ADMISSION_MAX_CONCURRENCY,
+    APP_HOST,
+    APP_PORT,
+    FORM_PAGE_CACHE_SIZE,
+    SCHEMA_FILE_PATH,
+    MICRO_BATCH_ENABLED,
+    PREDICTION_ARROW_MAX_ROWS,
+    PREDICTION_CACHE_ENABLED,
+    PREDICTION_MAX_BATCH_SIZE,
+    PREDICTION_STREAM_SPOOL_SIZE,
+    REQUEST_COALESCING_ENABLED,
+)
+from car_price.pipeline.training_job import (
+    TrainingJobManager,
+    TrainingJobRunningError,
+)
+from car_price.utils.executors import (
+    get_inference_executor,
+    run_in_executor,
+    shutdown_executors,
+)
+from car_price.utils.metrics import REGISTRY
+from car_price.utils.process_memory import get_process_memory
 
 app = FastAPI()
 
@@ -18,6 +64,86 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 
+# (method, path) of the prediction routes guarded by the admission controller
+ADMISSION_CONTROLLED_ROUTES = {
+    ("POST", "/predict"),
+    ("POST", "/predict/batch"),
+    ("POST", "/predict/arrow"),
+}
+
+
+class AdmissionControlMiddleware:
+    """
+    Sheds prediction requests the admission controller has no slot for with a
+    503 and a Retry-After hint, and answers those still running at their
+    deadline with a 504. Inference already running in a thread finishes in the
+    background, its result is discarded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        admission_controller = None
+        if scope["type"] == "http":
+            admission_controller = getattr(
+                scope["app"].state, "admission_controller", None
+            )
+        if (
+            admission_controller is None
+            or (scope["method"], scope["path"]) not in ADMISSION_CONTROLLED_ROUTES
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        deadline = admission_controller.get_deadline()
+        reason = await admission_controller.acquire(deadline)
+        if reason is not None:
+            response = JSONResponse(
+                {
+                    "status": False,
+                    "error": f"Server overloaded ({reason}), retry later",
+                },
+                status_code=503,
+                headers={"Retry-After": str(admission_controller.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await asyncio.wait_for(
+                self.app(scope, receive, send_wrapper),
+                admission_controller.get_remaining(deadline),
+            )
+
+        except asyncio.TimeoutError:
+            admission_controller.shed("deadline_exceeded")
+            if response_started:
+                raise
+            response = JSONResponse(
+                {
+                    "status": False,
+                    "error": f"Prediction deadline of {admission_controller.timeout}s exceeded",
+                },
+                status_code=504,
+            )
+            await response(scope, receive, send)
+
+        finally:
+            admission_controller.release()
+
+
+# Added first so CORS wraps it and shed 503s carry the CORS headers too
+app.add_middleware(AdmissionControlMiddleware)
+
 origins = ["*"]
 
 app.add_middleware(
@@ -29,6 +155,165 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start_time = time.perf_counter()
+    response = await call_next(request)
+
+    # Label with the route template so path parameters do not explode the series
+    route = request.scope.get("route")
+    REGISTRY.histogram(
+        "car_price_http_request_seconds",
+        "Latency of HTTP requests by route",
+        method=request.method,
+        route=route.path if route is not None else "unmatched",
+        status=str(response.status_code),
+    ).observe(time.perf_counter() - start_time)
+    return response
+
+
+def collect_cache_metrics() -> list:
+    """Reports the model and prediction cache counters to the metrics registry."""
+    model_cache_stats = ModelCache.get_instance().get_stats()
+    samples = [
+        (
+            "car_price_model_cache_lookups_total",
+            "counter",
+            "Model cache lookups by result",
+            {"result": "hit"},
+            model_cache_stats["hits"],
+        ),
+        (
+            "car_price_model_cache_lookups_total",
+            "counter",
+            "Model cache lookups by result",
+            {"result": "miss"},
+            model_cache_stats["misses"],
+        ),
+        (
+            "car_price_model_reloads_total",
+            "counter",
+            "Model reloads from S3",
+            {},
+            model_cache_stats["reloads"],
+        ),
+        (
+            "car_price_model_refresh_errors_total",
+            "counter",
+            "Failed model refresh attempts",
+            {},
+            model_cache_stats["refresh_errors"],
+        ),
+    ]
+
+    if app.state.prediction_cache is not None:
+        prediction_cache_stats = app.state.prediction_cache.get_stats()
+        for result, stat in (("hit", "hits"), ("miss", "misses")):
+            samples.append(
+                (
+                    "car_price_prediction_cache_lookups_total",
+                    "counter",
+                    "Prediction cache lookups by result",
+                    {"result": result},
+                    prediction_cache_stats[stat],
+                )
+            )
+        samples.append(
+            (
+                "car_price_prediction_cache_entries",
+                "gauge",
+                "Entries held by the prediction cache",
+                {},
+                prediction_cache_stats["size"],
+            )
+        )
+        samples.append(
+            (
+                "car_price_prediction_cache_memory_bytes",
+                "gauge",
+                "Approximate memory held by the prediction cache",
+                {},
+                prediction_cache_stats["memory_bytes"],
+            )
+        )
+    return samples
+
+
+def load_app_resources() -> None:
+    """Loads the car list and schema once for all requests."""
+    utils = MainUtils()
+    app.state.car_list = utils.get_car_list()
+    app.state.schema_config = utils.read_yaml_file(filename=SCHEMA_FILE_PATH)
+
+    # Rendered GET /predict page and its ETag, keyed on the request base url
+    app.state.form_pages = {}
+    CarBatchData._schema_config = app.state.schema_config
+
+
+def get_form_page(request: Request) -> tuple:
+    base_url = str(request.base_url)
+    page = app.state.form_pages.get(base_url)
+    if page is None:
+        response = templates.TemplateResponse(
+            "car_price.html",
+            {
+                "request": request,
+                "context": "Rendering",
+                "car_list": app.state.car_list,
+            },
+        )
+        page = (response.body, '"' + hashlib.md5(response.body).hexdigest() + '"')
+        if len(app.state.form_pages) < FORM_PAGE_CACHE_SIZE:
+            app.state.form_pages[base_url] = page
+    return page
+
+
+@app.on_event("startup")
+async def startup_event():
+    load_app_resources()
+    REGISTRY.register_collector(collect_cache_metrics)
+
+    # Readiness is reported once the model is loaded and its code paths are warm
+    app.state.model_warmer = ModelWarmer(car_list=app.state.car_list)
+    app.state.model_warmer.start()
+
+    # New models are only swapped in once they pass the warm-up predictions
+    model_cache = ModelCache.get_instance()
+    model_cache.sanity_check = app.state.model_warmer.check_model
+    model_cache.start()
+
+    app.state.prediction_cache = None
+    if PREDICTION_CACHE_ENABLED:
+        app.state.prediction_cache = PredictionCache()
+
+    app.state.request_coalescer = None
+    if REQUEST_COALESCING_ENABLED:
+        app.state.request_coalescer = RequestCoalescer()
+
+    app.state.admission_controller = None
+    if ADMISSION_MAX_CONCURRENCY > 0:
+        app.state.admission_controller = AdmissionController()
+        REGISTRY.register_collector(app.state.admission_controller.collect_metrics)
+
+    app.state.micro_batcher = None
+    if MICRO_BATCH_ENABLED:
+        app.state.micro_batcher = MicroBatcher(CarPricePredictor().predict)
+        app.state.micro_batcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.model_warmer.stop()
+    ModelCache.get_instance().stop()
+
+    if app.state.micro_batcher is not None:
+        app.state.micro_batcher.stop()
+
+    TrainingJobManager.get_instance().shutdown()
+    shutdown_executors()
+    close_clients()
+
+
 class DataForm:
     def __init__(self, request: Request):
         self.request: Request = request
@@ -57,30 +342,123 @@ class DataForm:
         self.seats = form.get("seats")
 
 
+async def compute_car_price(car_price_data: CarData) -> float:
+    if app.state.micro_batcher is not None:
+        with REGISTRY.predict_stage("dataframe_construction").time():
+            car_price_df = car_price_data.get_carprice_input_data_frame()
+        future = app.state.micro_batcher.submit(car_price_df)
+        car_price_value = round((await asyncio.wrap_future(future))[0], 2)
+    else:
+        with REGISTRY.predict_stage("dataframe_construction").time():
+            car_price_record = car_price_data.get_record()
+        car_price_predictor = CarPricePredictor()
+        car_price_values = await run_in_executor(
+            get_inference_executor(),
+            car_price_predictor.predict_records,
+            [car_price_record],
+        )
+        car_price_value = round(car_price_values[0], 2)
+
+    return car_price_value
+
+
+async def predict_car_price(car_price_data: CarData) -> float:
+    prediction_cache = app.state.prediction_cache
+    request_coalescer = app.state.request_coalescer
+    cache_key, model_version = None, None
+    if prediction_cache is not None or request_coalescer is not None:
+        cache_key = car_price_data.get_cache_key()
+
+    if prediction_cache is not None:
+        model_version = ModelCache.get_instance().version
+        if cache_key is not None:
+            car_price_value = prediction_cache.get(cache_key, model_version)
+            if car_price_value is not None:
+                return car_price_value
+
+    if request_coalescer is not None:
+        # Identical requests already being priced share that computation
+        car_price_value = await request_coalescer.run(
+            cache_key, partial(compute_car_price, car_price_data)
+        )
+    else:
+        car_price_value = await compute_car_price(car_price_data)
+
+    if prediction_cache is not None and cache_key is not None:
+        # Skip caching if the model was swapped while this prediction was running
+        current_version = ModelCache.get_instance().version
+        if model_version is None or model_version == current_version:
+            prediction_cache.put(cache_key, car_price_value, current_version)
+
+    return car_price_value
+
+
 @app.get("/train")
-async def trainRouteClient():
+async def trainRouteClient(
+    incremental: Optional[bool] = None, full_refresh: Optional[bool] = None
+):
     try:
-        train_pipeline = TrainPipeline()
+        job_manager = TrainingJobManager.get_instance()
+        job, _ = job_manager.submit(incremental=incremental, full_refresh=full_refresh)
+        job = await job_manager.wait(job.job_id)
 
-        train_pipeline.run_pipeline()
+        if job.status == "failed":
+            return Response(f"Error Occurred! {job.error}")
 
         return Response("Training successful !!")
 
+    except TrainingJobRunningError as e:
+        return Response(f"Error Occurred! {e}", status_code=409)
+
     except Exception as e:
         return Response(f"Error Occurred! {e}")
 
 
+@app.post("/train")
+async def trainJobRouteClient(
+    incremental: Optional[bool] = None, full_refresh: Optional[bool] = None
+):
+    try:
+        # e.g. POST /train?full_refresh=true rebuilds the ingestion snapshot
+        job, created = TrainingJobManager.get_instance().submit(
+            incremental=incremental, full_refresh=full_refresh
+        )
+
+        return JSONResponse({**job.to_dict(), "created": created}, status_code=202)
+
+    except TrainingJobRunningError as e:
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=409)
+
+    except Exception as e:
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=500)
+
+
+@app.get("/train/{job_id}")
+async def trainJobStatusRouteClient(job_id: str):
+    job = TrainingJobManager.get_instance().get_job(job_id)
+    if job is None:
+        return JSONResponse(
+            {"status": False, "error": f"Unknown training job {job_id}"},
+            status_code=404,
+        )
+
+    return job.to_dict()
+
+
 @app.get("/predict")
 async def predictGetRouteClient(request: Request):
     try:
-        utils = MainUtils()
+        body, etag = get_form_page(request)
+        headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
 
-        car_list = utils.get_car_list()
+        if_none_match = request.headers.get("if-none-match", "")
+        client_etags = [
+            tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")
+        ]
+        if etag in client_etags or "*" in client_etags:
+            return Response(status_code=304, headers=headers)
 
-        return templates.TemplateResponse(
-            "car_price.html",
-            {"request": request, "context": "Rendering", "car_list": car_list},
-        )
+        return Response(body, media_type="text/html", headers=headers)
 
     except Exception as e:
         return Response(f"Error Occurred! {e}")
@@ -89,10 +467,9 @@ async def predictGetRouteClient(request: Request):
 @app.post("/predict")
 async def predictRouteClient(request: Request):
     try:
-        utils = MainUtils()
-        car_list = utils.get_car_list()
         form = DataForm(request)
-        await form.get_car_data()
+        with REGISTRY.predict_stage("form_parsing").time():
+            await form.get_car_data()
 
         car_price_data = CarData(
             car_name=form.car_name,
@@ -107,18 +484,205 @@ async def predictRouteClient(request: Request):
             seats=form.seats,
         )
 
-        car_price_df = car_price_data.get_carprice_input_data_frame()
-        car_price_predictor = CarPricePredictor()
-        car_price_value = round(car_price_predictor.predict(X=car_price_df)[0], 2)
+        car_price_value = await predict_car_price(car_price_data)
 
-        return templates.TemplateResponse(
-            "car_price.html",
-            {"request": request, "context": car_price_value, "car_list": car_list},
+        with REGISTRY.predict_stage("template_render").time():
+            return templates.TemplateResponse(
+                "car_price.html",
+                {
+                    "request": request,
+                    "context": car_price_value,
+                    "car_list": app.state.car_list,
+                },
+            )
+
+    except Exception as e:
+        return {"status": False, "error": f"{e}"}
+
+
+@app.post("/predict/batch")
+async def predictBatchRouteClient(request: Request):
+    try:
+        body = await request.json()
+        records = body.get("records") if isinstance(body, dict) else body
+
+        if not isinstance(records, list) or not all(
+            isinstance(record, dict) for record in records
+        ):
+            return JSONResponse(
+                {"status": False, "error": "Expected a list of car records"},
+                status_code=400,
+            )
+
+        if len(records) > PREDICTION_MAX_BATCH_SIZE:
+            return JSONResponse(
+                {
+                    "status": False,
+                    "error": f"Batch size {len(records)} exceeds the maximum of {PREDICTION_MAX_BATCH_SIZE}",
+                },
+                status_code=413,
+            )
+
+        if len(records) == 0:
+            return {"status": True, "predictions": []}
+
+        with REGISTRY.predict_stage("dataframe_construction").time():
+            car_price_df, errors = CarBatchData(records).get_carprice_input_data_frame()
+        if len(errors) > 0:
+            return JSONResponse(
+                {"status": False, "errors": errors},
+                status_code=422,
+            )
+
+        car_price_predictor = CarPricePredictor()
+        car_price_values = await run_in_executor(
+            get_inference_executor(), car_price_predictor.predict, X=car_price_df
         )
 
+        return {
+            "status": True,
+            "predictions": [round(float(value), 2) for value in car_price_values],
+        }
+
     except Exception as e:
         return {"status": False, "error": f"{e}"}
 
 
+@app.post("/predict/arrow")
+async def predictArrowRouteClient(request: Request):
+    arrow_scorer = ArrowScorer()
+    try:
+        body = await request.body()
+        valid_df, errors = await run_in_executor(
+            get_inference_executor(), arrow_scorer.read_input, body
+        )
+
+    except Exception as e:
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=400)
+
+    n_rows = len(valid_df) + len(errors)
+    if n_rows > PREDICTION_ARROW_MAX_ROWS:
+        return JSONResponse(
+            {
+                "status": False,
+                "error": f"{n_rows} rows exceed the maximum of {PREDICTION_ARROW_MAX_ROWS}",
+            },
+            status_code=413,
+        )
+
+    try:
+        result = await run_in_executor(
+            get_inference_executor(), arrow_scorer.score, valid_df, errors
+        )
+
+        return Response(result, media_type=ARROW_STREAM_MEDIA_TYPE)
+
+    except Exception as e:
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=500)
+
+
+@app.post("/predict/stream")
+async def predictStreamRouteClient(request: Request, format: Optional[str] = None):
+    try:
+        file_format = format
+        if file_format is None:
+            content_type = request.headers.get("content-type", "")
+            file_format = "csv" if "csv" in content_type else "jsonl"
+
+        # The body is spooled first: reading it while the response streams would
+        # race with the disconnect listener of StreamingResponse for messages
+        body_file = tempfile.SpooledTemporaryFile(max_size=PREDICTION_STREAM_SPOOL_SIZE)
+        async for chunk in request.stream():
+            body_file.write(chunk)
+        body_file.seek(0)
+
+        stream_scorer = StreamScorer(body_file, file_format)
+
+    except Exception as e:
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=400)
+
+    async def generate_results():
+        try:
+            while True:
+                results = await run_in_executor(
+                    get_inference_executor(), stream_scorer.score_next_chunk
+                )
+                if results is None:
+                    break
+                yield results
+
+        except Exception as e:
+            yield json.dumps({"error": f"{e}"}) + "\n"
+
+        finally:
+            body_file.close()
+
+    return StreamingResponse(generate_results(), media_type="application/x-ndjson")
+
+
+@app.post("/reload")
+async def reloadRouteClient():
+    try:
+        load_app_resources()
+
+        return {"status": True, "car_list_size": len(app.state.car_list)}
+
+    except Exception as e:
+        return JSONResponse({"status": False, "error": f"{e}"}, status_code=500)
+
+
+@app.post("/model/reload")
+async def modelReloadRouteClient():
+    model_cache = ModelCache.get_instance()
+    if not model_cache.request_reload():
+        return JSONResponse(
+            {"status": False, "error": "Model refresh is disabled"},
+            status_code=409,
+        )
+
+    return JSONResponse(
+        {"status": True, "model_version": model_cache.version}, status_code=202
+    )
+
+
+@app.get("/stats")
+async def statsRouteClient():
+    stats = {
+        "model_cache": ModelCache.get_instance().get_stats(),
+        "metrics": REGISTRY.get_stats(),
+        "process": get_process_memory(),
+    }
+    if app.state.prediction_cache is not None:
+        stats["prediction_cache"] = app.state.prediction_cache.get_stats()
+    if app.state.request_coalescer is not None:
+        stats["request_coalescer"] = app.state.request_coalescer.get_stats()
+    if app.state.admission_controller is not None:
+        stats["admission_controller"] = app.state.admission_controller.get_stats()
+
+    return stats
+
+
+@app.get("/healthz")
+async def healthzRouteClient():
+    return {"status": True, **app.state.model_warmer.get_status()}
+
+
+@app.get("/readyz")
+async def readyzRouteClient():
+    model_warmer = app.state.model_warmer
+    return JSONResponse(
+        {"status": model_warmer.is_ready, **model_warmer.get_status()},
+        status_code=200 if model_warmer.is_ready else 503,
+    )
+
+
+@app.get("/metrics")
+async def metricsRouteClient():
+    return PlainTextResponse(
+        REGISTRY.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 if __name__ == "__main__":
     app_run(app, host=APP_HOST, port=APP_PORT)
@@ -0,0 +1,140 @@
+"""
+Compares scoring through POST /predict/arrow with POST /predict/batch.
+
+Both endpoints get the same synthetic cars and the time is measured on the
+client, from encoding the request to decoding the prices, so serialization on
+both ends is counted. The app is run in-process with a local model artifact.
+
+    python benchmarks/arrow_scoring.py --model-path car_price_model.pkl --rows 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from itertools import islice
+
+# The JSON endpoint must accept the whole table in one request, and neither
+# endpoint may be cut short by the prediction deadline
+os.environ.setdefault("PREDICTION_MAX_BATCH_SIZE", "1000000")
+os.environ.setdefault("PREDICTION_REQUEST_TIMEOUT", "0")
+os.environ.setdefault("LOG_LEVEL", "INFO")
+
+sys.path.insert(0, os.getcwd())
+
+import httpx
+import pandas as pd
+import pyarrow as pa
+from car_price.components.arrow_scorer import ARROW_STREAM_MEDIA_TYPE
+from car_price.components.model_cache import ModelCache
+from car_price.pipeline.load_test import generate_records
+
+
+async def score_json(client: httpx.AsyncClient, df: pd.DataFrame) -> tuple:
+    body = json.dumps(df.to_dict(orient="records")).encode()
+    response = await client.post(
+        "/predict/batch", content=body, headers={"content-type": "application/json"}
+    )
+    response.raise_for_status()
+    predictions = response.json()["predictions"]
+    return len(body), len(predictions)
+
+
+async def score_arrow(client: httpx.AsyncClient, df: pd.DataFrame) -> tuple:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    body = sink.getvalue().to_pybytes()
+
+    response = await client.post(
+        "/predict/arrow",
+        content=body,
+        headers={"content-type": ARROW_STREAM_MEDIA_TYPE},
+    )
+    response.raise_for_status()
+    predictions = pa.ipc.open_stream(response.content).read_all().column("prediction")
+    return len(body), len(predictions)
+
+
+async def run_benchmark(args: argparse.Namespace) -> list:
+    from uvicorn.importer import import_from_string
+
+    ModelCache.set_instance(ModelCache(model_path=args.model_path))
+    app = import_from_string(args.app)
+
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=None
+        ) as client:
+            while (await client.get("/readyz")).status_code != 200:
+                await asyncio.sleep(0.5)
+
+            for n_rows in args.rows:
+                df = pd.DataFrame.from_records(
+                    list(islice(generate_records(args.seed), n_rows))
+                )
+                for name, score in (("json", score_json), ("arrow", score_arrow)):
+                    timings = []
+                    for _ in range(args.repeat):
+                        start_time = time.perf_counter()
+                        request_bytes, n_predictions = await score(client, df)
+                        timings.append(time.perf_counter() - start_time)
+                        assert n_predictions == n_rows
+
+                    seconds = statistics.median(timings)
+                    results.append(
+                        {
+                            "rows": n_rows,
+                            "endpoint": name,
+                            "seconds": seconds,
+                            "rows_per_second": n_rows / seconds,
+                            "request_bytes": request_bytes,
+                        }
+                    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--model-path",
+        default=os.environ.get("LOCAL_MODEL_PATH"),
+        required="LOCAL_MODEL_PATH" not in os.environ,
+        help="local model artifact to serve",
+    )
+    parser.add_argument("--app", default="app:app")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file the results are written to")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args))
+
+    print(
+        f"{'rows':>8} {'endpoint':>8} {'seconds':>9} {'rows/s':>10} {'request MB':>10}"
+    )
+    for result in results:
+        print(
+            f"{result['rows']:>8} {result['endpoint']:>8} {result['seconds']:>9.3f} "
+            f"{result['rows_per_second']:>10.0f} {result['request_bytes'] / 1e6:>10.2f}"
+        )
+    for n_rows in args.rows:
+        seconds = {r["endpoint"]: r["seconds"] for r in results if r["rows"] == n_rows}
+        print(
+            f"{n_rows} rows: arrow is {seconds['json'] / seconds['arrow']:.1f}x faster"
+        )
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Compares the bulk writer of MongoDBOperation.insert_dataframe_as_record with
+the previous JSON round trip and single insert_many call.
+
+Without --url the documents go to an in-process stand-in that BSON-encodes
+every insert_many call, like the driver does before sending it, and sleeps for
+a round trip plus a per-document server time, so concurrent chunks can overlap
+their waits as with a real server.
+
+    python benchmarks/mongo_bulk_insert.py --rows 200000 --workers 1 4
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from json import loads
+from types import SimpleNamespace
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("LOG_LEVEL", "INFO")
+
+sys.path.insert(0, os.getcwd())
+
+import bson
+import pandas as pd
+
+DB_NAME = "benchmark"
+COLLECTION_NAME = "car_insert"
+
+
+class StandInCollection:
+    def __init__(self, round_trip: float, per_document: float):
+        self.round_trip = round_trip
+        self.per_document = per_document
+        self.count = 0
+
+    def insert_many(self, documents, ordered: bool = True) -> SimpleNamespace:
+        documents = list(documents)
+        for document in documents:
+            document.setdefault("_id", bson.ObjectId())
+            bson.encode(document)
+        time.sleep(self.round_trip + self.per_document * len(documents))
+        self.count += len(documents)
+        return SimpleNamespace(inserted_ids=[document["_id"] for document in documents])
+
+    def drop(self) -> None:
+        self.count = 0
+
+    def count_documents(self, query: dict) -> int:
+        return self.count
+
+
+class StandInDatabase:
+    def __init__(self, collection: StandInCollection):
+        self.collection = collection
+
+    def get_collection(self, name: str) -> StandInCollection:
+        return self.collection
+
+    __getitem__ = get_collection
+
+
+class StandInClient:
+    def __init__(self, round_trip: float, per_document: float):
+        self.database = StandInDatabase(StandInCollection(round_trip, per_document))
+
+    def __getitem__(self, db_name: str) -> StandInDatabase:
+        return self.database
+
+
+def load_generate_documents():
+    # Listings are generated like in the ingestion benchmark
+    spec = importlib.util.spec_from_file_location(
+        "mongo_ingestion", os.path.join(os.path.dirname(__file__), "mongo_ingestion.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.generate_documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument(
+        "--round-trip-ms",
+        type=float,
+        default=5,
+        help="delay of every insert_many call of the stand-in",
+    )
+    parser.add_argument(
+        "--server-us-per-document",
+        type=float,
+        default=10,
+        help="delay per inserted document of the stand-in",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="MongoDB url, the stand-in is used if omitted")
+    parser.add_argument("--output", help="JSON file the results are written to")
+    args = parser.parse_args()
+
+    if args.url is not None:
+        os.environ["MONGODB_URL"] = args.url
+    import pymongo
+    import car_price.configuration.mongo_operations as mongo_operations
+
+    if args.url is None:
+        client = StandInClient(
+            args.round_trip_ms / 1000, args.server_us_per_document / 1e6
+        )
+        pymongo.MongoClient = lambda *_, **__: client
+    mongo_op = mongo_operations.MongoDBOperation()
+
+    collection = mongo_op.get_database(DB_NAME)[COLLECTION_NAME]
+    df = pd.DataFrame.from_records(
+        list(load_generate_documents()(args.rows, args.seed))
+    )
+
+    runs = [("json round trip", None)] + [
+        (f"chunked, {workers} worker(s)", workers) for workers in args.workers
+    ]
+    results = []
+    for name, workers in runs:
+        collection.drop()
+        start_time = time.perf_counter()
+        if workers is None:
+            collection.insert_many(loads(df.T.to_json()).values())
+        else:
+            mongo_op.insert_dataframe_as_record(
+                df,
+                DB_NAME,
+                COLLECTION_NAME,
+                chunk_size=args.chunk_size,
+                workers=workers,
+            )
+        seconds = time.perf_counter() - start_time
+        assert collection.count_documents({}) == len(df)
+        results.append(
+            {
+                "mode": name,
+                "rows": len(df),
+                "seconds": seconds,
+                "rows_per_second": len(df) / seconds,
+            }
+        )
+    collection.drop()
+
+    print(f"{'mode':>24} {'rows':>8} {'seconds':>8} {'rows/s':>9}")
+    for result in results:
+        print(
+            f"{result['mode']:>24} {result['rows']:>8} {result['seconds']:>8.2f} "
+            f"{result['rows_per_second']:>9.0f}"
+        )
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
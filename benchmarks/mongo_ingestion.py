@@ -0,0 +1,170 @@
+"""
+Compares the full-document MongoDB read of the training pipeline with the
+streaming, projected read of MongoDBOperation.get_collection_as_dataframe.
+
+Each mode runs in its own process, against mongomock seeded with synthetic car
+listings (or a real server with --url), and reports rows per second and the
+peak RSS growth of the read over the seeded process.
+
+    python benchmarks/mongo_ingestion.py --rows 50000
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("LOG_LEVEL", "INFO")
+
+sys.path.insert(0, os.getcwd())
+
+MODES = ("full", "streaming")
+DB_NAME = "benchmark"
+COLLECTION_NAME = "car"
+
+
+class PeakRssSampler:
+    """Polls the RSS of this process to catch its peak during a measured block."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def get_rss() -> int:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.peak = max(self.peak, self.get_rss())
+            time.sleep(self.interval)
+
+    def __enter__(self) -> "PeakRssSampler":
+        self.peak = self.get_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop_event.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.get_rss())
+
+
+def generate_documents(n_rows: int, seed: int = 0):
+    from car_price.pipeline.load_test import generate_records
+
+    rng = random.Random(seed)
+    for record in generate_records(seed):
+        if n_rows == 0:
+            return
+        n_rows -= 1
+        brand, model = record["car_name"].split(" ", 1) + [""] * (
+            " " not in record["car_name"]
+        )
+        yield {
+            **record,
+            "brand": brand,
+            "model": model,
+            "selling_price": rng.randint(100000, 5000000),
+        }
+
+
+def run_mode(args: argparse.Namespace) -> dict:
+    if args.url is not None:
+        os.environ["MONGODB_URL"] = args.url
+    import pymongo
+    import car_price.configuration.mongo_operations as mongo_operations
+    from car_price.entity.config_entity import DataIngestionConfig
+
+    if args.url is None:
+        import mongomock
+
+        client = mongomock.MongoClient()
+        pymongo.MongoClient = lambda *_, **__: client
+    mongo_op = mongo_operations.MongoDBOperation()
+
+    collection = mongo_op.get_database(DB_NAME)[COLLECTION_NAME]
+    if args.url is None or args.seed_collection:
+        collection.drop()
+        documents = list(generate_documents(args.rows, args.seed))
+        for start in range(0, len(documents), 10000):
+            collection.insert_many(documents[start : start + 10000])
+        del documents
+
+    config = DataIngestionConfig()
+    with PeakRssSampler() as sampler:
+        baseline = sampler.peak
+        start_time = time.perf_counter()
+        if args.mode == "full":
+            df = mongo_op.get_collection_as_dataframe(DB_NAME, COLLECTION_NAME)
+            df = df.drop(config.DROP_COLS, axis=1)
+        else:
+            df = mongo_op.get_collection_as_dataframe(
+                DB_NAME,
+                COLLECTION_NAME,
+                column_types=config.COLUMN_TYPES,
+                batch_size=args.batch_size,
+            )
+        seconds = time.perf_counter() - start_time
+
+    return {
+        "mode": args.mode,
+        "rows": len(df),
+        "seconds": seconds,
+        "rows_per_second": len(df) / seconds,
+        "peak_rss_growth_mb": (sampler.peak - baseline) / 1e6,
+        "dataframe_mb": df.memory_usage(deep=True).sum() / 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="MongoDB url, mongomock is used if omitted")
+    parser.add_argument(
+        "--seed-collection",
+        action="store_true",
+        help="replace the benchmark collection of --url with synthetic listings",
+    )
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="JSON file the results are written to")
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        print(json.dumps(run_mode(args)))
+        return
+
+    results = []
+    for mode in MODES:
+        output = subprocess.check_output(
+            [sys.executable, __file__, "--mode", mode] + sys.argv[1:]
+        )
+        results.append(json.loads(output.decode().strip().splitlines()[-1]))
+
+    print(
+        f"{'mode':>10} {'rows':>8} {'seconds':>8} {'rows/s':>9} {'peak RSS MB':>12} {'frame MB':>9}"
+    )
+    for result in results:
+        print(
+            f"{result['mode']:>10} {result['rows']:>8} {result['seconds']:>8.2f} "
+            f"{result['rows_per_second']:>9.0f} {result['peak_rss_growth_mb']:>12.1f} "
+            f"{result['dataframe_mb']:>9.1f}"
+        )
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Measures how the _id range-partitioned read of
+MongoDBOperation.get_collection_as_dataframe scales with the number of
+partitions.
+
+Without --url the collection is served by an in-process stand-in answering
+_id range queries from a sorted index, with a delay added to every cursor batch
+for the network round trip and server time of a real getMore, which is what
+parallel partitions overlap. The frames read with every partition count are
+checked to be identical.
+
+    python benchmarks/mongo_partitioned_read.py --rows 50000 --partitions 1 2 4 8
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from bisect import bisect_left, bisect_right
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("LOG_LEVEL", "INFO")
+
+sys.path.insert(0, os.getcwd())
+
+import pandas as pd
+from bson import ObjectId
+
+DB_NAME = "benchmark"
+COLLECTION_NAME = "car"
+
+
+class StandInCursor:
+    """Cursor over documents sorted on _id, sleeping `latency` seconds before every batch."""
+
+    def __init__(
+        self, documents: list, projection: dict, batch_size: int, latency: float
+    ):
+        self.documents = documents
+        self.projection = projection
+        self.batch_size = batch_size
+        self.latency = latency
+
+    def sort(self, key: str, direction: int = 1) -> "StandInCursor":
+        if key != "_id" or direction != 1:
+            raise NotImplementedError("the stand-in only sorts on ascending _id")
+        return self
+
+    def skip(self, n: int) -> "StandInCursor":
+        self.documents = self.documents[n:]
+        return self
+
+    def limit(self, n: int) -> "StandInCursor":
+        self.documents = self.documents[:n]
+        return self
+
+    def __iter__(self):
+        fields = [field for field, include in self.projection.items() if include]
+        for idx, document in enumerate(self.documents):
+            if idx % self.batch_size == 0:
+                time.sleep(self.latency)
+            yield {field: document[field] for field in fields if field in document}
+
+
+class StandInCollection:
+    """
+    In-process stand-in for a collection with an _id index: documents are kept
+    sorted on _id and _id range queries are answered by bisection. Only the
+    queries of the partitioned read are supported.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.documents: list = []
+        self.ids: list = []
+
+    def insert_many(self, documents: list) -> None:
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+        self.documents = sorted(self.documents + documents, key=lambda d: d["_id"])
+        self.ids = [document["_id"] for document in self.documents]
+
+    def drop(self) -> None:
+        self.documents, self.ids = [], []
+
+    def estimated_document_count(self) -> int:
+        return len(self.documents)
+
+    def _select(self, query: dict) -> list:
+        conditions = query.get("$and", [query] if query else [])
+        lower, upper = 0, len(self.ids)
+        for condition in conditions:
+            if set(condition) != {"_id"}:
+                raise NotImplementedError(f"unsupported query {condition}")
+            for operator, value in condition["_id"].items():
+                if operator == "$gte":
+                    lower = max(lower, bisect_left(self.ids, value))
+                elif operator == "$gt":
+                    lower = max(lower, bisect_right(self.ids, value))
+                elif operator == "$lt":
+                    upper = min(upper, bisect_left(self.ids, value))
+                else:
+                    raise NotImplementedError(f"unsupported operator {operator}")
+        return self.documents[lower:upper]
+
+    def count_documents(self, query: dict) -> int:
+        return len(self._select(query))
+
+    def find(self, query: dict, projection: dict, batch_size: int = 101):
+        return StandInCursor(self._select(query), projection, batch_size, self.latency)
+
+
+class StandInDatabase:
+    def __init__(self, collection: StandInCollection):
+        self.collection = collection
+
+    def get_collection(self, name: str) -> StandInCollection:
+        return self.collection
+
+    __getitem__ = get_collection
+
+
+class StandInClient:
+    def __init__(self, latency: float):
+        self.database = StandInDatabase(StandInCollection(latency))
+
+    def __getitem__(self, db_name: str) -> StandInDatabase:
+        return self.database
+
+
+def install_stand_in(latency: float) -> None:
+    import pymongo
+
+    client = StandInClient(latency)
+    pymongo.MongoClient = lambda *_, **__: client
+
+
+def load_generate_documents():
+    # Listings are generated like in the ingestion benchmark
+    spec = importlib.util.spec_from_file_location(
+        "mongo_ingestion", os.path.join(os.path.dirname(__file__), "mongo_ingestion.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.generate_documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--partitions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--batch-latency-ms",
+        type=float,
+        default=10,
+        help="delay of every cursor batch of the stand-in",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="MongoDB url, the stand-in is used if omitted")
+    parser.add_argument("--output", help="JSON file the results are written to")
+    args = parser.parse_args()
+
+    if args.url is None:
+        install_stand_in(args.batch_latency_ms / 1000)
+    else:
+        os.environ["MONGODB_URL"] = args.url
+
+    import car_price.configuration.mongo_operations as mongo_operations
+    from car_price.entity.config_entity import DataIngestionConfig
+
+    mongo_op = mongo_operations.MongoDBOperation()
+
+    collection = mongo_op.get_database(DB_NAME)[COLLECTION_NAME]
+    if args.url is None or collection.estimated_document_count() != args.rows:
+        collection.drop()
+        documents = list(load_generate_documents()(args.rows, args.seed))
+        for start in range(0, len(documents), 10000):
+            collection.insert_many(documents[start : start + 10000])
+        del documents
+
+    column_types = DataIngestionConfig().COLUMN_TYPES
+    results, reference_df = [], None
+    for partitions in args.partitions:
+        timings = []
+        for _ in range(args.repeat):
+            start_time = time.perf_counter()
+            df = mongo_op.get_collection_as_dataframe(
+                DB_NAME,
+                COLLECTION_NAME,
+                column_types=column_types,
+                batch_size=args.batch_size,
+                partitions=partitions,
+            )
+            timings.append(time.perf_counter() - start_time)
+
+        if reference_df is None:
+            reference_df = df
+        else:
+            pd.testing.assert_frame_equal(df, reference_df)
+
+        seconds = min(timings)
+        results.append(
+            {
+                "partitions": partitions,
+                "rows": len(df),
+                "seconds": seconds,
+                "rows_per_second": len(df) / seconds,
+            }
+        )
+
+    print(f"{'partitions':>10} {'rows':>8} {'seconds':>8} {'rows/s':>9} {'speedup':>8}")
+    for result in results:
+        print(
+            f"{result['partitions']:>10} {result['rows']:>8} {result['seconds']:>8.2f} "
+            f"{result['rows_per_second']:>9.0f} "
+            f"{results[0]['seconds'] / result['seconds']:>7.1f}x"
+        )
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
-import logging
 import os
 from from_root import from_root
-from car_price.constant import ARTIFACTS_DIR, LOGS_DIR, LOGS_FILE_NAME
+from car_price.constant import (
+    ARTIFACTS_DIR,
+    LOG_LEVEL,
+    LOG_RATE_LIMIT,
+    LOG_SAMPLE_RATE,
+    LOGS_DIR,
+    LOGS_FILE_NAME,
+)
+from car_price.utils.log_utils import configure_logging
 
 logs_path = os.path.join(from_root(), ARTIFACTS_DIR, LOGS_DIR)
 
@@ -9,8 +16,9 @@ os.makedirs(logs_path, exist_ok=True)
 
 LOG_FILE_PATH = os.path.join(logs_path, LOGS_FILE_NAME)
 
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format="[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s",
-    level=logging.DEBUG,
+configure_logging(
+    LOG_FILE_PATH,
+    level=LOG_LEVEL,
+    sample_rate=LOG_SAMPLE_RATE,
+    rate_limit=LOG_RATE_LIMIT,
 )
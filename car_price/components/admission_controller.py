@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from car_price.constant import *
+from car_price.utils.metrics import REGISTRY, Sample
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+SHED_REASONS = ("queue_full", "queue_timeout", "deadline_exceeded")
+
+
+class AdmissionController:
+    """
+    Bounds the prediction requests served at once and the requests waiting for
+    a slot, so an overload is answered with fast rejections instead of an
+    unbounded queue whose requests time out on the client anyway.
+
+    Up to `max_concurrency` requests run at once and up to `max_queue_depth`
+    more wait for a slot in arrival order. A request arriving to a full queue,
+    or still waiting when its deadline of `timeout` seconds has passed, is
+    shed. Must be used from one event loop.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = ADMISSION_MAX_CONCURRENCY,
+        max_queue_depth: int = ADMISSION_MAX_QUEUE_DEPTH,
+        timeout: float = PREDICTION_REQUEST_TIMEOUT,
+        retry_after: int = ADMISSION_RETRY_AFTER,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.timeout = timeout
+        self.retry_after = retry_after
+
+        self.in_flight = 0
+        self._waiters: Deque["asyncio.Future"] = deque()
+
+        self.admitted = REGISTRY.counter(
+            "car_price_admitted_requests_total",
+            "Prediction requests admitted by the admission controller",
+        )
+        self.shed_counters = {
+            reason: REGISTRY.counter(
+                "car_price_shed_requests_total",
+                "Prediction requests rejected under overload by reason",
+                reason=reason,
+            )
+            for reason in SHED_REASONS
+        }
+        self.queue_wait_histogram = REGISTRY.histogram(
+            "car_price_admission_queue_wait_seconds",
+            "Time an admitted prediction request waited for a slot",
+        )
+
+    def get_deadline(self) -> Optional[float]:
+        if self.timeout <= 0:
+            return None
+        return time.monotonic() + self.timeout
+
+    @staticmethod
+    def get_remaining(deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+        return max(deadline - time.monotonic(), 0.0)
+
+    def shed(self, reason: str) -> None:
+        self.shed_counters[reason].inc()
+        logger.warning("Shed prediction request: %s", reason)
+
+    async def acquire(self, deadline: Optional[float] = None) -> Optional[str]:
+
+        """
+        Method Name :   acquire
+
+        Description :   This method takes a slot for a request, waiting in the queue until a slot is
+                        free or the deadline has passed. A taken slot must be given back with release.
+
+        Output      :   None if the request was admitted, else the reason it was shed
+        """
+        start_time = time.perf_counter()
+        if self.in_flight < self.max_concurrency and len(self._waiters) == 0:
+            self.in_flight += 1
+            self.admitted.inc()
+            self.queue_wait_histogram.observe(0.0)
+            return None
+
+        if len(self._waiters) >= self.max_queue_depth:
+            self.shed("queue_full")
+            return "queue_full"
+
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.get_remaining(deadline))
+
+        except asyncio.TimeoutError:
+            # The slot may have been handed over as the deadline passed
+            if not (waiter.done() and not waiter.cancelled()):
+                self.shed("queue_timeout")
+                return "queue_timeout"
+
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        self.admitted.inc()
+        self.queue_wait_histogram.observe(time.perf_counter() - start_time)
+        return None
+
+    def release(self) -> None:
+        # The slot is handed to the oldest waiter, in_flight is unchanged then
+        while len(self._waiters) > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def collect_metrics(self) -> List[Sample]:
+        return [
+            (
+                "car_price_admission_in_flight",
+                "gauge",
+                "Prediction requests holding an admission slot",
+                {},
+                self.in_flight,
+            ),
+            (
+                "car_price_admission_queued",
+                "gauge",
+                "Prediction requests waiting for an admission slot",
+                {},
+                len(self._waiters),
+            ),
+        ]
+
+    def get_stats(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue_depth": self.max_queue_depth,
+            "timeout": self.timeout,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": int(self.admitted.value),
+            "shed": {
+                reason: int(counter.value)
+                for reason, counter in self.shed_counters.items()
+            },
+            "queue_wait": self.queue_wait_histogram.get_stats(),
+        }
@@ -0,0 +1,146 @@
+import logging
+import sys
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from pandas import DataFrame
+from car_price.components.model_predictor import CarBatchData, CarPricePredictor
+from car_price.exception import CarException
+from car_price.utils.metrics import REGISTRY
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class ArrowScorer:
+    """
+    Scores car records sent as an Arrow IPC stream whose columns match
+    schema.yaml, and returns the prices as an Arrow IPC stream.
+
+    Columns are validated and filtered in Arrow and handed to pandas without
+    going through Python objects, except for the string columns the encoders
+    need as objects. The response batch has one row per input row, in input
+    order: `prediction` is null and `error` set for rows that fail validation.
+    """
+
+    def __init__(self, predictor: Optional[CarPricePredictor] = None):
+        self.predictor = predictor if predictor is not None else CarPricePredictor()
+
+    def read_input(self, body: bytes) -> Tuple[DataFrame, Dict[int, str]]:
+
+        """
+        Method Name :   read_input
+
+        Description :   This method reads the Arrow IPC stream and validates its columns against the schema.
+                        The whole stream is rejected if a feature column is missing or has an unusable type.
+
+        Output      :   DataFrame of valid rows indexed by row position and a dictionary of row position
+                        to error message
+        """
+        logger.debug("Entered read_input method of ArrowScorer class")
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+
+            # Reading from a buffer over the body does not copy the column data
+            table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+
+            schema_config = CarBatchData.get_schema_config()
+            feature_columns = CarBatchData.get_feature_columns()
+            missing_columns = [
+                col for col in feature_columns if col not in table.column_names
+            ]
+            if len(missing_columns) > 0:
+                raise ValueError(f"missing columns {missing_columns}")
+
+            with REGISTRY.predict_stage("dataframe_construction").time():
+                columns: List = []
+                errors: Dict[int, List[str]] = {}
+                valid = np.ones(table.num_rows, dtype=bool)
+                for col in feature_columns:
+                    values = table.column(col)
+                    if col in schema_config["numerical_columns"]:
+                        if not (
+                            pa.types.is_integer(values.type)
+                            or pa.types.is_floating(values.type)
+                        ):
+                            try:
+                                values = pc.cast(values, pa.float64())
+                            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                                raise ValueError(
+                                    f"column {col} is not numeric: {e}"
+                                ) from e
+                        message = f"invalid {col}"
+                    else:
+                        if not pa.types.is_string(values.type):
+                            values = pc.cast(values, pa.string())
+                        message = f"missing {col}"
+
+                    if values.null_count > 0 or pa.types.is_floating(values.type):
+                        is_null = (
+                            pc.is_null(values, nan_is_null=True)
+                            .to_numpy(zero_copy_only=False)
+                            .astype(bool)
+                        )
+                        for row in np.flatnonzero(is_null):
+                            errors.setdefault(int(row), []).append(message)
+                        valid &= ~is_null
+                    columns.append(values)
+
+                table = pa.Table.from_arrays(columns, names=feature_columns)
+                if len(errors) > 0:
+                    table = table.filter(pa.array(valid))
+                valid_df = table.to_pandas(split_blocks=True)
+                valid_df.index = np.flatnonzero(valid)
+
+            logger.debug("Exited read_input method of ArrowScorer class")
+            return valid_df, {row: ", ".join(msgs) for row, msgs in errors.items()}
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def score(self, valid_df: DataFrame, errors: Dict[int, str]) -> bytes:
+
+        """
+        Method Name :   score
+
+        Description :   This method predicts the valid rows with one model call and writes the prices and
+                        row errors as an Arrow IPC stream.
+
+        Output      :   Arrow IPC stream bytes
+        """
+        logger.debug("Entered score method of ArrowScorer class")
+        try:
+            import pyarrow as pa
+
+            n_rows = len(valid_df) + len(errors)
+            predictions = np.zeros(n_rows, dtype=np.float64)
+            is_valid = np.zeros(n_rows, dtype=bool)
+            if len(valid_df) > 0:
+                predictions[valid_df.index] = np.round(
+                    np.asarray(self.predictor.predict(X=valid_df), dtype=np.float64),
+                    2,
+                )
+                is_valid[valid_df.index] = True
+
+            error_values = [None] * n_rows
+            for row, error in errors.items():
+                error_values[row] = error
+
+            batch = pa.RecordBatch.from_arrays(
+                [
+                    pa.array(predictions, mask=~is_valid),
+                    pa.array(error_values, type=pa.string()),
+                ],
+                names=["prediction", "error"],
+            )
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, batch.schema) as writer:
+                writer.write_batch(batch)
+
+            logger.debug("Exited score method of ArrowScorer class")
+            return sink.getvalue().to_pybytes()
+
+        except Exception as e:
+            raise CarException(e, sys) from e
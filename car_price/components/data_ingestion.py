@@ -6,6 +6,7 @@ from sklearn.model_selection import train_test_split
 from typing import Tuple
 from car_price.exception import CarException
 from car_price.configuration.mongo_operations import MongoDBOperation
+from car_price.components.data_snapshot import DataSnapshot
 from car_price.entity.config_entity import DataIngestionConfig
 from car_price.entity.artifacts_entity import DataIngestionArtifacts
 from car_price.constant import TEST_SIZE
@@ -35,10 +36,13 @@ class DataIngestion:
         try:
             logger.info("Getting the dataframe from mongodb")
 
-            # Getting collection from MongoDB database
+            # Streaming only the schema columns from MongoDB database
             df = self.mongo_op.get_collection_as_dataframe(
                 self.data_ingestion_config.DB_NAME,
                 self.data_ingestion_config.COLLECTION_NAME,
+                column_types=self.data_ingestion_config.COLUMN_TYPES,
+                batch_size=self.data_ingestion_config.BATCH_SIZE,
+                partitions=self.data_ingestion_config.READ_PARTITIONS,
             )
             logger.info("Got the dataframe from mongodb")
             logger.info(
@@ -49,6 +53,70 @@ class DataIngestion:
         except Exception as e:
             raise CarException(e, sys) from e
 
+    # This method will fetch the new data from mongoDB and merge it into the snapshot
+    def get_incremental_data_from_mongodb(self) -> DataFrame:
+
+        """
+        Method Name :   get_incremental_data_from_mongodb
+
+        Description :   This method fetches the documents added or changed since the last ingestion and
+                        merges them into the local data snapshot. The whole collection is read if there is
+                        no usable snapshot or a full refresh is requested.
+
+        Output      :   DataFrame 
+        """
+        logger.info(
+            "Entered get_incremental_data_from_mongodb method of Data_Ingestion class"
+        )
+        try:
+            config = self.data_ingestion_config
+            data_snapshot = DataSnapshot(
+                config.SNAPSHOT_DIR,
+                config.DB_NAME,
+                config.COLLECTION_NAME,
+                config.WATERMARK_FIELD,
+            )
+
+            # _id keys the snapshot rows, the watermark field is only read to move the watermark
+            snapshot_columns = [*config.COLUMN_TYPES, "_id"]
+            column_types = {**config.COLUMN_TYPES, "_id": "object"}
+            column_types.setdefault(config.WATERMARK_FIELD, "object")
+            snapshot_df, watermark = None, None
+            if not config.FULL_REFRESH:
+                snapshot_df, watermark = data_snapshot.load(snapshot_columns)
+
+            new_df = self.mongo_op.get_collection_as_dataframe(
+                config.DB_NAME,
+                config.COLLECTION_NAME,
+                column_types=column_types,
+                batch_size=config.BATCH_SIZE,
+                query=data_snapshot.get_query(watermark),
+                partitions=config.READ_PARTITIONS,
+            )
+            watermark = data_snapshot.get_watermark(
+                new_df[config.WATERMARK_FIELD], watermark
+            )
+            if config.WATERMARK_FIELD not in snapshot_columns:
+                new_df = new_df.drop(columns=[config.WATERMARK_FIELD])
+            new_df["_id"] = new_df["_id"].astype(str)
+
+            if snapshot_df is None:
+                df = new_df
+            else:
+                df = DataSnapshot.merge(snapshot_df, new_df)
+            data_snapshot.save(df, watermark)
+
+            logger.info(
+                f"Fetched {len(new_df)} new or changed documents, the snapshot holds {len(df)}"
+            )
+            logger.info(
+                "Exited get_incremental_data_from_mongodb method of Data_Ingestion class"
+            )
+            return df.drop(columns=["_id"])
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
     # This method will split the data
     def split_data_as_train_test(self, df: DataFrame) -> Tuple[DataFrame, DataFrame]:
 
@@ -125,10 +193,15 @@ class DataIngestion:
         logger.info("Entered initiate_data_ingestion method of Data_Ingestion class")
         try:
             # Getting data from MongoDB
-            df = self.get_data_from_mongodb()
-
-            # Dropping the unnecessary columns from dataframe
-            df1 = df.drop(self.data_ingestion_config.DROP_COLS, axis=1)
+            if self.data_ingestion_config.INCREMENTAL:
+                df = self.get_incremental_data_from_mongodb()
+            else:
+                df = self.get_data_from_mongodb()
+
+            # Dropping the unnecessary columns from dataframe, they are not projected anymore
+            df1 = df.drop(
+                self.data_ingestion_config.DROP_COLS, axis=1, errors="ignore"
+            )
             logger.info("Got the data from mongodb")
 
             # Splitting the data as train set and test set
@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+from bson import ObjectId
+from pandas import DataFrame
+from car_price.constant import *
+from car_price.exception import CarException
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+
+class DataSnapshot:
+    """
+    Local Parquet copy of a MongoDB collection and the watermark of the newest
+    document it holds, so an ingestion only fetches the documents added or
+    changed since the previous one.
+
+    The watermark is the largest value of `watermark_field` seen. `_id` picks up
+    new documents; an update timestamp field also picks up changed ones. Rows
+    are keyed on `_id` and a refetched document replaces its previous row.
+    Deleted documents are only dropped by a full refresh.
+    """
+
+    def __init__(
+        self,
+        snapshot_dir: str,
+        db_name: str,
+        collection_name: str,
+        watermark_field: str = MONGO_WATERMARK_FIELD,
+    ):
+        self.watermark_field = watermark_field
+        self.snapshot_file_path = os.path.join(
+            snapshot_dir, f"{db_name}.{collection_name}.parquet"
+        )
+        self.watermark_file_path = os.path.join(
+            snapshot_dir, f"{db_name}.{collection_name}.watermark.json"
+        )
+
+    @staticmethod
+    def _encode_watermark(watermark: Any) -> Optional[Dict]:
+        if watermark is None:
+            return None
+        if isinstance(watermark, ObjectId):
+            return {"type": "objectid", "value": str(watermark)}
+        if isinstance(watermark, datetime):
+            return {"type": "datetime", "value": watermark.isoformat()}
+        return {"type": "value", "value": watermark}
+
+    @staticmethod
+    def _decode_watermark(watermark: Optional[Dict]) -> Any:
+        if watermark is None:
+            return None
+        if watermark["type"] == "objectid":
+            return ObjectId(watermark["value"])
+        if watermark["type"] == "datetime":
+            return datetime.fromisoformat(watermark["value"])
+        return watermark["value"]
+
+    def load(self, columns: List[str]) -> Tuple[Optional[DataFrame], Any]:
+
+        """
+        Method Name :   load
+
+        Description :   This method loads the snapshot and its watermark. A snapshot taken with other
+                        columns or another watermark field is ignored, so the next ingestion is a full one.
+
+        Output      :   Snapshot DataFrame and watermark, or None and None
+        """
+        logger.info("Entered load method of DataSnapshot class")
+        try:
+            if not (
+                os.path.exists(self.snapshot_file_path)
+                and os.path.exists(self.watermark_file_path)
+            ):
+                logger.info("No data snapshot found, running a full ingestion")
+                return None, None
+
+            with open(self.watermark_file_path) as f:
+                metadata = json.load(f)
+            if metadata["watermark_field"] != self.watermark_field or sorted(
+                metadata["columns"]
+            ) != sorted(columns):
+                logger.info("Data snapshot is outdated, running a full ingestion")
+                return None, None
+
+            df = pd.read_parquet(self.snapshot_file_path)
+            watermark = self._decode_watermark(metadata["watermark"])
+            logger.info(f"Loaded data snapshot of {len(df)} rows up to {watermark}")
+            logger.info("Exited load method of DataSnapshot class")
+            return df, watermark
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def save(self, df: DataFrame, watermark: Any) -> None:
+
+        """
+        Method Name :   save
+
+        Description :   This method replaces the snapshot and its watermark, the watermark being written
+                        last so an interrupted save is never read with a newer watermark.
+
+        Output      :   None
+        """
+        logger.info("Entered save method of DataSnapshot class")
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_file_path), exist_ok=True)
+            if os.path.exists(self.watermark_file_path):
+                os.remove(self.watermark_file_path)
+
+            tmp_file_path = self.snapshot_file_path + ".tmp"
+            df.to_parquet(tmp_file_path, index=False)
+            os.replace(tmp_file_path, self.snapshot_file_path)
+
+            metadata = {
+                "watermark_field": self.watermark_field,
+                "watermark": self._encode_watermark(watermark),
+                "columns": list(df.columns),
+                "rows": len(df),
+                "updated_at": datetime.now().isoformat(),
+            }
+            tmp_file_path = self.watermark_file_path + ".tmp"
+            with open(tmp_file_path, "w") as f:
+                json.dump(metadata, f, indent=2)
+            os.replace(tmp_file_path, self.watermark_file_path)
+            logger.info("Exited save method of DataSnapshot class")
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def get_query(self, watermark: Any) -> Dict:
+        if watermark is None:
+            return {}
+        # Timestamps can repeat, documents at the watermark are fetched again
+        operator = "$gt" if self.watermark_field == "_id" else "$gte"
+        return {self.watermark_field: {operator: watermark}}
+
+    @staticmethod
+    def get_watermark(values: pd.Series, watermark: Any) -> Any:
+        values = [value for value in values if value is not None and value == value]
+        if watermark is not None:
+            values.append(watermark)
+        return max(values) if len(values) > 0 else None
+
+    @staticmethod
+    def merge(snapshot_df: DataFrame, new_df: DataFrame) -> DataFrame:
+        unchanged_df = snapshot_df[~snapshot_df["_id"].isin(new_df["_id"])]
+        return pd.concat([unchanged_df, new_df], ignore_index=True)
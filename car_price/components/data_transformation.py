@@ -7,6 +7,7 @@ import pandas as pd
 from category_encoders.binary import BinaryEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from car_price.components.feature_encoder import CompiledFeatureEncoder
 from car_price.entity.config_entity import DataTransformationConfig
 from car_price.entity.artifacts_entity import (
     DataIngestionArtifacts,
@@ -227,6 +228,21 @@ class DataTransformation:
             logger.info(
                 "Saved the preprocessor object in DataTransformation artifacts directory."
             )
+
+            # Compiling the fitted preprocessor into the serving fast path encoder
+            feature_encoder = CompiledFeatureEncoder.build(
+                preprocessor,
+                pd.concat([input_feature_train_df, input_feature_test_df]),
+            )
+            feature_encoder_file = None
+            if feature_encoder is not None:
+                feature_encoder_file = self.data_transformation_config.UTILS.save_object(
+                    self.data_transformation_config.FEATURE_ENCODER_FILE_PATH,
+                    feature_encoder,
+                )
+                logger.info(
+                    "Saved the compiled feature encoder in DataTransformation artifacts directory."
+                )
             logger.info(
                 "Exited initiate_data_transformation method of Data_Transformation class"
             )
@@ -236,6 +252,7 @@ class DataTransformation:
                 transformed_object_file_path=preprocessor_obj_file,
                 transformed_train_file_path=transformed_train_file,
                 transformed_test_file_path=transformed_test_file,
+                feature_encoder_file_path=feature_encoder_file,
             )
 
             return data_transformation_artifacts
@@ -0,0 +1,254 @@
+import logging
+import math
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from pandas import DataFrame
+from category_encoders.binary import BinaryEncoder
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from car_price.exception import CarException
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class CompiledFeatureEncoder:
+    """
+    Inference-time replacement for the fitted preprocessing ColumnTransformer.
+
+    Categorical columns are encoded with precomputed lookup tables and numerical
+    columns are scaled with the stored means and scales, writing straight into
+    a NumPy row. Only OneHotEncoder, BinaryEncoder and StandardScaler blocks
+    are supported, which is what DataTransformation builds.
+    """
+
+    def __init__(self, preprocessor: object):
+        # (column, offset, width, lookup table, unknown row, missing row)
+        self._categorical_blocks: List[
+            Tuple[str, int, int, Dict[Any, np.ndarray], np.ndarray, np.ndarray]
+        ] = []
+        numeric_columns: List[str] = []
+        numeric_index: List[int] = []
+        means: List[float] = []
+        scales: List[float] = []
+
+        offset = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+
+            if isinstance(transformer, OneHotEncoder):
+                offset = self._compile_one_hot(transformer, columns, offset)
+
+            elif isinstance(transformer, BinaryEncoder):
+                offset = self._compile_binary(transformer, columns, offset)
+
+            elif isinstance(transformer, StandardScaler):
+                for idx, column in enumerate(columns):
+                    numeric_columns.append(column)
+                    numeric_index.append(offset + idx)
+                    means.append(
+                        transformer.mean_[idx] if transformer.with_mean else 0.0
+                    )
+                    scales.append(
+                        transformer.scale_[idx] if transformer.with_std else 1.0
+                    )
+                offset += len(columns)
+
+            else:
+                raise ValueError(f"Unsupported transformer {name} for compiled encoder")
+
+        self.n_features = offset
+        self._numeric_columns = numeric_columns
+        self._numeric_index = np.array(numeric_index, dtype=np.intp)
+        self._means = np.array(means, dtype=np.float64)
+        self._scales = np.array(scales, dtype=np.float64)
+        self._local = threading.local()
+
+    def _compile_one_hot(
+        self, transformer: OneHotEncoder, columns: List[str], offset: int
+    ) -> int:
+        if getattr(transformer, "drop_idx_", None) is not None:
+            raise ValueError("OneHotEncoder with drop is not supported")
+
+        for column, categories in zip(columns, transformer.categories_):
+            width = len(categories)
+            table: Dict[Any, np.ndarray] = {}
+            missing_row = np.zeros(width)
+            for idx, category in enumerate(categories):
+                row = np.zeros(width)
+                row[idx] = 1.0
+                if _is_missing(category):
+                    missing_row = row
+                else:
+                    table[category] = row
+            self._categorical_blocks.append(
+                (column, offset, width, table, np.zeros(width), missing_row)
+            )
+            offset += width
+        return offset
+
+    def _compile_binary(
+        self, transformer: BinaryEncoder, columns: List[str], offset: int
+    ) -> int:
+        # Older category_encoders wrap a BaseNEncoder, newer ones subclass it
+        base_n_encoder = getattr(transformer, "base_n_encoder", transformer)
+        if (
+            base_n_encoder.handle_unknown != "value"
+            or base_n_encoder.handle_missing != "value"
+        ):
+            raise ValueError(
+                "BinaryEncoder must use handle_unknown/handle_missing='value'"
+            )
+
+        ordinal_mappings = {
+            mapping["col"]: mapping["mapping"]
+            for mapping in base_n_encoder.ordinal_encoder.category_mapping
+        }
+        digit_mappings = {
+            mapping["col"]: mapping["mapping"] for mapping in base_n_encoder.mapping
+        }
+
+        for column in columns:
+            digits = digit_mappings[column]
+            width = digits.shape[1]
+            table: Dict[Any, np.ndarray] = {}
+            for category, ordinal in ordinal_mappings[column].items():
+                if not _is_missing(category):
+                    table[category] = digits.loc[ordinal].to_numpy(dtype=np.float64)
+            self._categorical_blocks.append(
+                (
+                    column,
+                    offset,
+                    width,
+                    table,
+                    digits.loc[-1].to_numpy(dtype=np.float64),
+                    digits.loc[-2].to_numpy(dtype=np.float64),
+                )
+            )
+            offset += width
+        return offset
+
+    def _encode_into(self, record: Dict, row: np.ndarray) -> np.ndarray:
+        for block in self._categorical_blocks:
+            column, offset, width, table, unknown_row, missing_row = block
+            value = record.get(column)
+            if _is_missing(value):
+                row[offset : offset + width] = missing_row
+            else:
+                row[offset : offset + width] = table.get(value, unknown_row)
+
+        numeric_values = np.array(
+            [
+                np.nan if _is_missing(record.get(column)) else float(record[column])
+                for column in self._numeric_columns
+            ],
+            dtype=np.float64,
+        )
+        row[self._numeric_index] = (numeric_values - self._means) / self._scales
+        return row
+
+    def transform_record(self, record: Dict) -> np.ndarray:
+
+        """
+        Method Name :   transform_record
+
+        Description :   This method encodes one car record into a preallocated per-thread row.
+                        The returned array is reused by the next call on the same thread.
+
+        Output      :   Array of shape (1, n_features)
+        """
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = np.empty((1, self.n_features), dtype=np.float64)
+            self._local.row = row
+        self._encode_into(record, row[0])
+        return row
+
+    def transform_records(self, records: List[Dict]) -> np.ndarray:
+        rows = np.empty((len(records), self.n_features), dtype=np.float64)
+        for idx, record in enumerate(records):
+            self._encode_into(record, rows[idx])
+        return rows
+
+    def transform(self, X: DataFrame) -> np.ndarray:
+        return self.transform_records(X.to_dict("records"))
+
+    @staticmethod
+    def get_learned_categories(preprocessor: object) -> Dict[str, List]:
+
+        """
+        Method Name :   get_learned_categories
+
+        Description :   This method reads the categories the OneHotEncoder and BinaryEncoder blocks of the
+                        fitted preprocessor learned, leaving out missing values.
+
+        Output      :   Dictionary of column to its known categories
+        """
+        categories: Dict[str, List] = {}
+        for _, transformer, columns in getattr(preprocessor, "transformers_", []):
+            if isinstance(transformer, OneHotEncoder):
+                for column, column_categories in zip(columns, transformer.categories_):
+                    categories[column] = list(column_categories)
+
+            elif isinstance(transformer, BinaryEncoder):
+                base_n_encoder = getattr(transformer, "base_n_encoder", transformer)
+                for mapping in base_n_encoder.ordinal_encoder.category_mapping:
+                    categories[mapping["col"]] = list(mapping["mapping"].index)
+
+        return {
+            column: [value for value in values if not _is_missing(value)]
+            for column, values in categories.items()
+        }
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state.pop("_local", None)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @classmethod
+    def build(
+        cls, preprocessor: object, sample_df: DataFrame
+    ) -> Optional["CompiledFeatureEncoder"]:
+
+        """
+        Method Name :   build
+
+        Description :   This method compiles the fitted preprocessor and checks that its output
+                        matches preprocessor.transform exactly on sample_df.
+
+        Output      :   Compiled feature encoder, or None if it cannot reproduce the preprocessor
+        """
+        logger.info("Entered build method of CompiledFeatureEncoder class")
+        try:
+            try:
+                encoder = cls(preprocessor)
+            except ValueError as e:
+                logger.info(f"Preprocessor can not be compiled: {e}")
+                return None
+
+            expected = preprocessor.transform(sample_df)
+            if hasattr(expected, "toarray"):
+                expected = expected.toarray()
+
+            if not np.array_equal(
+                encoder.transform(sample_df),
+                np.asarray(expected, dtype=np.float64),
+                equal_nan=True,
+            ):
+                logger.info("Compiled feature encoder does not match the preprocessor")
+                return None
+
+            logger.info("Exited build method of CompiledFeatureEncoder class")
+            return encoder
+
+        except Exception as e:
+            raise CarException(e, sys) from e
@@ -0,0 +1,151 @@
+import logging
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Sequence, Tuple
+import pandas as pd
+from pandas import DataFrame
+from car_price.constant import *
+from car_price.exception import CarException
+from car_price.utils.metrics import REGISTRY
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+class MicroBatcher:
+    """
+    Gathers single-car requests arriving within `max_wait` seconds, up to
+    `max_batch_size` rows, and scores them with one call of `predict_fn`.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[DataFrame], Sequence],
+        max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+        max_wait: float = MICRO_BATCH_MAX_WAIT_MS / 1000,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+        self.batch_size_histogram = REGISTRY.histogram(
+            "car_price_micro_batch_size",
+            "Number of rows scored per micro-batch",
+            BATCH_SIZE_BUCKETS,
+        )
+        self.queue_wait_histogram = REGISTRY.histogram(
+            "car_price_micro_batch_queue_wait_seconds",
+            "Time a request waited in the micro-batch queue",
+        )
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Started micro-batcher with max batch size {self.max_batch_size} and {self.max_wait}s window"
+        )
+
+    def stop(self) -> None:
+        self._queue.put(_STOP)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def submit(self, X: DataFrame) -> Future:
+
+        """
+        Method Name :   submit
+
+        Description :   This method queues the rows of X for the next micro-batch.
+
+        Output      :   Future resolving to the predictions of X
+        """
+        future: Future = Future()
+        self._queue.put((X, future, time.perf_counter()))
+        return future
+
+    def predict(self, X: DataFrame) -> Sequence:
+        return self.submit(X).result()
+
+    def _collect_batch(self) -> Optional[List[Tuple[DataFrame, Future, float]]]:
+        item = self._queue.get()
+        if item is _STOP:
+            return None
+
+        batch = [item]
+        rows = len(item[0])
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Re-queue the sentinel so the loop exits after this batch
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+            rows += len(item[0])
+
+        return batch
+
+    def _process(self, batch: List[Tuple[DataFrame, Future, float]]) -> None:
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            self.queue_wait_histogram.observe(started - enqueued)
+
+        X = pd.concat([item[0] for item in batch], ignore_index=True)
+        self.batch_size_histogram.observe(len(X))
+
+        try:
+            predictions = self.predict_fn(X)
+
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # A single bad request must not fail its neighbours, score them one by one
+            logger.info("Micro-batch failed, scoring requests individually")
+            for X_item, future, _ in batch:
+                try:
+                    future.set_result(self.predict_fn(X_item))
+                except Exception as item_error:
+                    future.set_exception(item_error)
+            return
+
+        offset = 0
+        for X_item, future, _ in batch:
+            future.set_result(predictions[offset : offset + len(X_item)])
+            offset += len(X_item)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                break
+            try:
+                self._process(batch)
+
+            except Exception as e:
+                error = CarException(e, sys)
+                logger.error("Micro-batch processing failed: %s", error)
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
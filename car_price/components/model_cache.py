@@ -0,0 +1,223 @@
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from car_price.constant import *
+from car_price.configuration.local_operations import LocalModelOperation
+from car_price.configuration.s3_operations import S3Operation
+from car_price.exception import CarException
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+
+class ModelCache:
+    """
+    Process-wide cache of the served CarPriceModel.
+
+    The model is downloaded and unpickled once, then a background thread polls
+    the ETag of the S3 object every `refresh_interval` seconds, or when a reload
+    is requested, and swaps in the new model when training pushes one.
+
+    A new model is loaded and passed to `sanity_check` while the current one
+    keeps serving, and only replaces it if the check passes. Requests hold the
+    model they started with, so in-flight predictions finish on the old model.
+    A `refresh_interval` of 0 only reloads on request, a negative one never.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        s3: Optional[S3Operation] = None,
+        bucket_name: str = BUCKET_NAME,
+        model_name: str = MODEL_FILE_NAME,
+        refresh_interval: int = MODEL_CACHE_REFRESH_INTERVAL,
+        sanity_check: Optional[Callable[[object], None]] = None,
+        model_path: Optional[str] = LOCAL_MODEL_PATH,
+    ):
+        if s3 is None:
+            s3 = (
+                LocalModelOperation(model_path)
+                if model_path is not None
+                else S3Operation()
+            )
+        self.s3 = s3
+        self.bucket_name = bucket_name
+        self.model_name = model_name
+        self.refresh_interval = refresh_interval
+        self.sanity_check = sanity_check
+
+        # (model, version) is swapped as a single reference
+        self._current: Optional[Tuple[object, str]] = None
+        self._load_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._reload_event = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.refresh_errors = 0
+        self.rejected_versions = 0
+        self.loaded_at: Optional[float] = None
+        self.last_refresh_error: Optional[str] = None
+
+    @classmethod
+    def get_instance(cls) -> "ModelCache":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def set_instance(cls, instance: "ModelCache") -> None:
+        with cls._instance_lock:
+            cls._instance = instance
+
+    @property
+    def version(self) -> Optional[str]:
+        current = self._current
+        return None if current is None else current[1]
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _load(self) -> Tuple[object, str]:
+        version = self.s3.get_model_version(self.model_name, self.bucket_name)
+        model = self.s3.load_model(self.model_name, self.bucket_name)
+        logger.info("Loaded model version %s from s3 bucket", version)
+        return model, version
+
+    def get_model(self) -> object:
+
+        """
+        Method Name :   get_model
+
+        Description :   This method returns the cached model, loading it from s3 bucket on first use.
+
+        Output      :   CarPriceModel object
+        """
+        current = self._current
+        if current is not None:
+            self._count("hits")
+            return current[0]
+
+        try:
+            with self._load_lock:
+                if self._current is None:
+                    self._count("misses")
+                    self._current = self._load()
+                    self.loaded_at = time.time()
+                else:
+                    self._count("hits")
+                return self._current[0]
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def refresh(self) -> bool:
+
+        """
+        Method Name :   refresh
+
+        Description :   This method checks the model version in s3 bucket and swaps in the new model if it changed
+                        and passes the sanity check.
+
+        Output      :   True if a new model was loaded else False
+        """
+        logger.info("Entered refresh method of ModelCache class")
+        try:
+            with self._load_lock:
+                version = self.s3.get_model_version(self.model_name, self.bucket_name)
+                if self._current is not None and self._current[1] == version:
+                    logger.info("Model version unchanged, skipping reload")
+                    return False
+
+                # Shadow load: the current model keeps serving until the swap
+                model, version = self._load()
+                if self.sanity_check is not None:
+                    try:
+                        self.sanity_check(model)
+                    except Exception:
+                        self._count("rejected_versions")
+                        raise
+
+                self._current = (model, version)
+                self.loaded_at = time.time()
+                self._count("reloads")
+                logger.info("Exited refresh method of ModelCache class")
+                return True
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def _refresh_loop(self) -> None:
+        timeout = self.refresh_interval if self.refresh_interval > 0 else None
+        while True:
+            self._reload_event.wait(timeout)
+            self._reload_event.clear()
+            if self._stop_event.is_set():
+                break
+
+            try:
+                self.refresh()
+                self.last_refresh_error = None
+
+            except Exception as e:
+                self._count("refresh_errors")
+                self.last_refresh_error = f"{e}"
+                logger.error("Model refresh failed, keeping the current model: %s", e)
+
+    def request_reload(self) -> bool:
+        """Wakes the refresh thread to check for a new model now."""
+        if self._refresh_thread is None or not self._refresh_thread.is_alive():
+            return False
+
+        self._reload_event.set()
+        return True
+
+    def start(self) -> None:
+        if self.refresh_interval < 0:
+            logger.info("Model cache refresh is disabled")
+            return
+
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._reload_event.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, name="model-cache-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+        logger.info(
+            "Started model cache refresh thread with %ss interval",
+            self.refresh_interval,
+        )
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._reload_event.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "refresh_errors": self.refresh_errors,
+                "rejected_versions": self.rejected_versions,
+                "last_refresh_error": self.last_refresh_error,
+                "version": self.version,
+                "loaded_at": self.loaded_at,
+                "refresh_interval": self.refresh_interval,
+            }
@@ -1,11 +1,13 @@
 import logging
 import sys
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from pandas import DataFrame
 import pandas as pd
 from car_price.constant import *
-from car_price.configuration.s3_operations import S3Operation
+from car_price.components.model_cache import ModelCache
 from car_price.exception import CarException
+from car_price.utils.main_utils import MainUtils
+from car_price.utils.metrics import REGISTRY
 
 # initializing logger
 logger = logging.getLogger(__name__)
@@ -45,7 +47,7 @@ class CarData:
         
         Output      :    Input data in dictionary
         """
-        logger.info("Entered get_data method of SensorData class")
+        logger.debug("Entered get_data method of SensorData class")
         try:
             # Saving the features as dictionary
             input_data = {
@@ -61,12 +63,35 @@ class CarData:
                 "seats": [self.seats],
             }
 
-            logger.info("Exited get_data method of SensorData class")
+            logger.debug("Exited get_data method of SensorData class")
             return input_data
 
         except Exception as e:
             raise CarException(e, sys)
 
+    def get_cache_key(self) -> Optional[Tuple]:
+
+        """
+        Method Name :   get_cache_key
+
+        Description :   This method normalizes the car features into a hashable key. Numerical 
+                        features are compared as floats, so "5" and 5.0 share one key.
+        
+        Output      :   Tuple of features, or None if a numerical feature is not a number
+        """
+        try:
+            numerical_columns = CarBatchData.get_schema_config()["numerical_columns"]
+            return tuple(
+                float(value) if column in numerical_columns else str(value)
+                for column, value in self.get_record().items()
+            )
+
+        except (TypeError, ValueError):
+            return None
+
+    def get_record(self) -> Dict:
+        return {column: values[0] for column, values in self.get_data().items()}
+
     def get_carprice_input_data_frame(self) -> DataFrame:
 
         """
@@ -76,15 +101,15 @@ class CarData:
         
         Output      :    DataFrame 
         """
-        logger.info(
+        logger.debug(
             "Entered get_carprice_input_data_frame method of CarPriceData class"
         )
         try:
             # Getting the data in dictionary format
             carprice_input_dict = self.get_data()
 
-            logger.info("Got car data as dict")
-            logger.info(
+            logger.debug("Got car data as dict")
+            logger.debug(
                 "Exited get_carprice_input_data_frame method of CarPriceData class"
             )
             return pd.DataFrame(carprice_input_dict)
@@ -93,9 +118,94 @@ class CarData:
             raise CarException(e, sys) from e
 
 
+class CarBatchData:
+    _schema_config: Optional[Dict] = None
+
+    def __init__(self, records: List[Dict]):
+        self.records = records
+
+    @classmethod
+    def get_schema_config(cls) -> Dict:
+        if cls._schema_config is None:
+            cls._schema_config = MainUtils().read_yaml_file(filename=SCHEMA_FILE_PATH)
+        return cls._schema_config
+
+    @classmethod
+    def get_feature_columns(cls) -> List[str]:
+        schema_config = cls.get_schema_config()
+        return [
+            column
+            for column in schema_config["columns"]
+            if column != schema_config["target_column"]
+        ]
+
+    @classmethod
+    def validate_input_data_frame(
+        cls, df: DataFrame
+    ) -> Tuple[DataFrame, Dict[int, str]]:
+
+        """
+        Method Name :   validate_input_data_frame
+
+        Description :   This method validates a block of input rows against the schema columns and types. 
+        
+        Output      :   DataFrame of valid rows and a dictionary of row position to error message 
+        """
+        logger.debug("Entered validate_input_data_frame method of CarBatchData class")
+        try:
+            schema_config = cls.get_schema_config()
+            feature_columns = cls.get_feature_columns()
+
+            missing_columns = [col for col in feature_columns if col not in df.columns]
+            if len(missing_columns) > 0:
+                error = f"missing columns {missing_columns}"
+                return df.iloc[0:0], {row: error for row in range(len(df))}
+
+            df = df[feature_columns].reset_index(drop=True)
+            errors: Dict[int, List[str]] = {}
+
+            # Coercing numerical columns, invalid values become NaN
+            for col in schema_config["numerical_columns"]:
+                values = pd.to_numeric(df[col], errors="coerce")
+                for row in values.index[values.isna()]:
+                    errors.setdefault(int(row), []).append(f"invalid {col}")
+                df[col] = values
+
+            for col in schema_config["categorical_columns"]:
+                for row in df.index[df[col].isna()]:
+                    errors.setdefault(int(row), []).append(f"missing {col}")
+
+            valid_df = df.drop(index=list(errors))
+            logger.debug("Exited validate_input_data_frame method of CarBatchData class")
+            return valid_df, {row: ", ".join(msgs) for row, msgs in errors.items()}
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def get_carprice_input_data_frame(self) -> Tuple[DataFrame, Dict[int, str]]:
+
+        """
+        Method Name :   get_carprice_input_data_frame
+
+        Description :   This method converts the list of records into a validated dataframe. 
+        
+        Output      :   DataFrame of valid rows and a dictionary of row position to error message 
+        """
+        logger.debug("Entered get_carprice_input_data_frame method of CarBatchData class")
+        try:
+            df = pd.DataFrame.from_records(self.records)
+            logger.debug("Exited get_carprice_input_data_frame method of CarBatchData class")
+            return self.validate_input_data_frame(df)
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+
 class CarPricePredictor:
-    def __init__(self):
-        self.s3 = S3Operation()
+    def __init__(self, model_cache: Optional[ModelCache] = None):
+        self.model_cache = (
+            model_cache if model_cache is not None else ModelCache.get_instance()
+        )
         self.bucket_name = BUCKET_NAME
 
     def predict(self, X) -> float:
@@ -107,15 +217,40 @@ class CarPricePredictor:
         
         Output      :   Predictions 
         """
-        logger.info("Entered predict method of CarPricePredictor class")
+        logger.debug("Entered predict method of CarPricePredictor class")
         try:
-            # Loading the best model from s3 bucket
-            best_model = self.s3.load_model(MODEL_FILE_NAME, self.bucket_name)
-            logger.info("Loaded best model from s3 bucket")
+            # Getting the best model from the process-wide model cache
+            with REGISTRY.predict_stage("model_fetch").time():
+                best_model = self.model_cache.get_model()
+            logger.debug("Got best model from model cache")
 
             # Predicting with best model
             result = best_model.predict(X)
-            logger.info("Exited predict method of CarPricePredictor class")
+            logger.debug("Exited predict method of CarPricePredictor class")
+            return result
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def predict_records(self, records: List[Dict]) -> float:
+
+        """
+        Method Name :   predict_records
+
+        Description :   This method predicts car records, using the compiled feature encoder 
+                        when FEATURE_ENCODER_FAST_PATH is enabled.
+        
+        Output      :   Predictions 
+        """
+        logger.debug("Entered predict_records method of CarPricePredictor class")
+        try:
+            if not FEATURE_ENCODER_FAST_PATH:
+                return self.predict(pd.DataFrame.from_records(records))
+
+            with REGISTRY.predict_stage("model_fetch").time():
+                best_model = self.model_cache.get_model()
+            result = best_model.predict_records(records)
+            logger.debug("Exited predict_records method of CarPricePredictor class")
             return result
 
         except Exception as e:
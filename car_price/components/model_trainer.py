@@ -2,8 +2,9 @@ import os
 import logging
 import sys
 import pandas as pd
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from pandas import DataFrame
+from car_price.components.feature_encoder import CompiledFeatureEncoder
 from car_price.constant import MODEL_CONFIG_FILE
 from car_price.entity.config_entity import ModelTrainerConfig
 from car_price.entity.artifacts_entity import (
@@ -11,15 +12,22 @@ from car_price.entity.artifacts_entity import (
     ModelTrainerArtifacts,
 )
 from car_price.exception import CarException
+from car_price.utils.metrics import REGISTRY
 
 # initializing logger
 logger = logging.getLogger(__name__)
 
 
 class CarPriceModel:
-    def __init__(self, preprocessing_object: object, trained_model_object: object):
+    def __init__(
+        self,
+        preprocessing_object: object,
+        trained_model_object: object,
+        feature_encoder: Optional[CompiledFeatureEncoder] = None,
+    ):
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
+        self.feature_encoder = feature_encoder
 
     def predict(self, X) -> float:
 
@@ -30,13 +38,43 @@ class CarPriceModel:
         
         Output      :   Predictions 
         """
-        logger.info("Entered predict method of CarPriceModel class")
+        logger.debug("Entered predict method of CarPriceModel class")
         try:
             # Using the trained model to get predictions
-            transformed_feature = self.preprocessing_object.transform(X)
-            logger.info("Used the trained model to get predictions")
+            with REGISTRY.predict_stage("preprocessing_transform").time():
+                transformed_feature = self.preprocessing_object.transform(X)
+            logger.debug("Used the trained model to get predictions")
 
-            return self.trained_model_object.predict(transformed_feature)
+            with REGISTRY.predict_stage("model_predict").time():
+                return self.trained_model_object.predict(transformed_feature)
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def predict_records(self, records: List[Dict]) -> float:
+
+        """
+        Method Name :   predict_records
+
+        Description :   This method predicts the records with the compiled feature encoder,
+                        falling back to the preprocessor for models trained without one.
+        
+        Output      :   Predictions 
+        """
+        try:
+            # Models pickled before the encoder existed have no such attribute
+            feature_encoder = getattr(self, "feature_encoder", None)
+            if feature_encoder is None:
+                return self.predict(pd.DataFrame.from_records(records))
+
+            with REGISTRY.predict_stage("preprocessing_transform").time():
+                if len(records) == 1:
+                    transformed_feature = feature_encoder.transform_record(records[0])
+                else:
+                    transformed_feature = feature_encoder.transform_records(records)
+
+            with REGISTRY.predict_stage("model_predict").time():
+                return self.trained_model_object.predict(transformed_feature)
 
         except Exception as e:
             raise CarException(e, sys) from e
@@ -161,6 +199,14 @@ class ModelTrainer:
             )
             logger.info("Loaded preprocessing object")
 
+            # Loading the compiled feature encoder if data transformation built one
+            feature_encoder = None
+            if self.data_transformation_artifact.feature_encoder_file_path is not None:
+                feature_encoder = self.model_trainer_config.UTILS.load_object(
+                    self.data_transformation_artifact.feature_encoder_file_path
+                )
+                logger.info("Loaded compiled feature encoder")
+
             # Reading model config file for getting the best model score
             model_config = self.model_trainer_config.UTILS.read_yaml_file(
                 filename=MODEL_CONFIG_FILE
@@ -173,7 +219,9 @@ class ModelTrainer:
                 # logger.info("Updating model score in yaml file")
 
                 # Loading car price model object with preprocessor and model
-                carprice_model = CarPriceModel(preprocessing_obj, best_model)
+                carprice_model = CarPriceModel(
+                    preprocessing_obj, best_model, feature_encoder
+                )
                 logger.info(
                     "Created car price model object with preprocessor and model"
                 )
@@ -0,0 +1,191 @@
+import logging
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from car_price.constant import *
+from car_price.components.feature_encoder import CompiledFeatureEncoder
+from car_price.components.model_predictor import CarBatchData, CarPricePredictor
+from car_price.exception import CarException
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+
+class ModelWarmer:
+    """
+    Loads the served model and runs synthetic predictions through it before the
+    service reports ready, so the first real request does not pay for the S3
+    download, the unpickle and the first-call overhead of the model libraries.
+
+    Synthetic records are built from the columns of schema.yaml, with the
+    categories the model's encoders learned, so the known-category path of real
+    traffic is warmed and checked. Car names fall back to the configured car list.
+    """
+
+    # Model version already warmed in this process, inherited by forked workers
+    _warmed_version: Optional[str] = None
+
+    def __init__(
+        self,
+        predictor: Optional[CarPricePredictor] = None,
+        car_list: Optional[List[str]] = None,
+        rounds: int = MODEL_WARMUP_ROUNDS,
+        batch_size: int = MODEL_WARMUP_BATCH_SIZE,
+        retry_interval: int = MODEL_WARMUP_RETRY_INTERVAL,
+    ):
+        self.predictor = predictor if predictor is not None else CarPricePredictor()
+        self.car_list = car_list if car_list else []
+        self.rounds = rounds
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+
+        self.status = "pending"
+        self.attempts = 0
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == "ready"
+
+    def get_warmup_records(
+        self, n_records: int, categories: Optional[Dict[str, List]] = None
+    ) -> List[Dict]:
+
+        """
+        Method Name :   get_warmup_records
+
+        Description :   This method builds synthetic car records from the columns of schema.yaml, cycling
+                        through the known categories of each categorical column.
+
+        Output      :   List of car records
+        """
+        schema_config = CarBatchData.get_schema_config()
+        columns = schema_config["columns"]
+        categories = dict(categories) if categories else {}
+        if len(categories.get("car_name", [])) == 0 and len(self.car_list) > 0:
+            categories["car_name"] = self.car_list
+        records = []
+        for idx in range(n_records):
+            record = {}
+            for column in CarBatchData.get_feature_columns():
+                if len(categories.get(column, [])) > 0:
+                    record[column] = categories[column][idx % len(categories[column])]
+                elif column in schema_config["numerical_columns"]:
+                    value = idx % 10 + 1
+                    record[column] = (
+                        float(value) if columns[column] == "float" else value
+                    )
+                else:
+                    record[column] = f"{column}_{idx}"
+            records.append(record)
+        return records
+
+    def check_model(self, model: object) -> None:
+
+        """
+        Method Name :   check_model
+
+        Description :   This method runs the batch and single-car prediction paths of a model on the
+                        synthetic records, and is used as the sanity check of a new model before it is served.
+
+        Output      :   None, raises ValueError if the predictions are not usable
+        """
+        categories = CompiledFeatureEncoder.get_learned_categories(
+            getattr(model, "preprocessing_object", None)
+        )
+        records = self.get_warmup_records(self.batch_size, categories)
+        car_price_df, _ = CarBatchData(records).get_carprice_input_data_frame()
+        predictions = np.asarray(model.predict(car_price_df), dtype=np.float64)
+        if predictions.shape != (len(records),) or not np.isfinite(predictions).all():
+            raise ValueError(
+                "Model returned invalid predictions for the warm-up records"
+            )
+
+        for record in records:
+            if FEATURE_ENCODER_FAST_PATH:
+                model.predict_records([record])
+            else:
+                model.predict(pd.DataFrame.from_records([record]))
+
+    def warm_up(self) -> float:
+
+        """
+        Method Name :   warm_up
+
+        Description :   This method loads the model and runs the single-car and batch prediction paths on
+                        synthetic records.
+
+        Output      :   Warm-up duration in seconds
+        """
+        logger.info("Entered warm_up method of ModelWarmer class")
+        try:
+            start_time = time.perf_counter()
+            model = self.predictor.model_cache.get_model()
+            model_version = self.predictor.model_cache.version
+            if (
+                model_version is not None
+                and model_version == ModelWarmer._warmed_version
+            ):
+                logger.info(f"Model version {model_version} is already warm")
+                return time.perf_counter() - start_time
+
+            for _ in range(self.rounds):
+                self.check_model(model)
+
+            ModelWarmer._warmed_version = model_version
+            duration = time.perf_counter() - start_time
+            logger.info(f"Model warm-up finished in {duration:.3f}s")
+            logger.info("Exited warm_up method of ModelWarmer class")
+            return duration
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.status = "warming"
+            self.attempts += 1
+            try:
+                self.duration = self.warm_up()
+                self.error = None
+                self.status = "ready"
+                return
+
+            except Exception as e:
+                self.error = f"{e}"
+                self.status = "failed"
+                logger.error(
+                    f"Model warm-up failed, retrying in {self.retry_interval}s: {e}"
+                )
+                self._stop_event.wait(self.retry_interval)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="model-warmer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def get_status(self) -> Dict:
+        return {
+            "warmup_status": self.status,
+            "model_version": self.predictor.model_cache.version,
+            "warmup_seconds": self.duration,
+            "attempts": self.attempts,
+            "error": self.error,
+        }
@@ -0,0 +1,115 @@
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+from car_price.constant import PREDICTION_CACHE_MAX_SIZE, PREDICTION_CACHE_TTL
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+
+def _entry_size(key: Tuple, value: float) -> int:
+    return (
+        sys.getsizeof(key)
+        + sum(sys.getsizeof(item) for item in key)
+        + sys.getsizeof(value)
+    )
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predicted prices keyed on the normalized car features.
+
+    Entries expire after `ttl` seconds and the whole cache is dropped when the
+    served model version changes.
+    """
+
+    def __init__(
+        self,
+        max_size: int = PREDICTION_CACHE_MAX_SIZE,
+        ttl: float = PREDICTION_CACHE_TTL,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (value, expires_at, size in bytes)
+        self._entries: "OrderedDict[Hashable, Tuple[float, float, int]]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, version: Optional[str]) -> None:
+        if version != self._version:
+            if len(self._entries) > 0:
+                logger.info(
+                    "Model version changed to %s, clearing prediction cache", version
+                )
+                self.invalidations += 1
+            self._entries.clear()
+            self._memory_bytes = 0
+            self._version = version
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._memory_bytes -= size
+
+    def get(self, key: Hashable, version: Optional[str]) -> Optional[float]:
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry[1] < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: float, version: Optional[str]) -> None:
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._remove(key)
+
+            size = _entry_size(key, value)
+            self._entries[key] = (value, time.monotonic() + self.ttl, size)
+            self._memory_bytes += size
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "memory_bytes": self._memory_bytes,
+                "model_version": self._version,
+            }
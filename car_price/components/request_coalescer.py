@@ -0,0 +1,69 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from car_price.utils.metrics import REGISTRY
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+
+class RequestCoalescer:
+    """
+    Single-flight execution of identical in-flight requests.
+
+    The first request for a key starts the computation and every identical
+    request arriving before it finishes awaits the same result, instead of
+    running the model again. Nothing is kept once the computation is done,
+    retention is the job of PredictionCache. Must be used from one event loop.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, "asyncio.Future"] = {}
+        self.leaders = REGISTRY.counter(
+            "car_price_coalesced_requests_total",
+            "Prediction requests by whether they computed or joined a result",
+            role="leader",
+        )
+        self.followers = REGISTRY.counter(
+            "car_price_coalesced_requests_total",
+            "Prediction requests by whether they computed or joined a result",
+            role="follower",
+        )
+
+    async def run(
+        self, key: Optional[Hashable], compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+
+        """
+        Method Name :   run
+
+        Description :   This method awaits the in-flight computation for key, or starts it with compute.
+                        Requests without a key are never coalesced.
+
+        Output      :   Result of the computation
+        """
+        if key is None:
+            return await compute()
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.leaders.inc()
+            # A task, so a disconnecting first caller does not cancel the others
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.followers.inc()
+
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict:
+        leaders, followers = self.leaders.value, self.followers.value
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": int(leaders),
+            "followers": int(followers),
+            "coalesced_rate": (
+                followers / (leaders + followers) if leaders + followers > 0 else 0.0
+            ),
+        }
@@ -0,0 +1,129 @@
+import csv
+import json
+import logging
+import sys
+from typing import BinaryIO, Dict, List, Optional, Tuple
+import pandas as pd
+from car_price.components.model_predictor import CarBatchData, CarPricePredictor
+from car_price.constant import PREDICTION_STREAM_CHUNK_SIZE
+from car_price.exception import CarException
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+
+class StreamScorer:
+    """
+    Scores a JSONL or CSV file of car records in fixed-size chunks.
+
+    Each call of `score_next_chunk` reads at most `chunk_size` rows, runs the
+    valid ones through one CarPriceModel.predict call and returns one JSON line
+    per input row, so memory stays flat whatever the size of the file.
+    Invalid rows get an inline error instead of aborting the stream.
+    """
+
+    def __init__(
+        self,
+        file_obj: BinaryIO,
+        file_format: str,
+        chunk_size: int = PREDICTION_STREAM_CHUNK_SIZE,
+        predictor: Optional[CarPricePredictor] = None,
+    ):
+        if file_format not in ("jsonl", "csv"):
+            raise ValueError(f"Unsupported stream format {file_format}")
+
+        self.file_obj = file_obj
+        self.file_format = file_format
+        self.chunk_size = chunk_size
+        self.predictor = predictor if predictor is not None else CarPricePredictor()
+        self._header: Optional[List[str]] = None
+        self._row_number = 0
+
+    def _parse_line(self, line: str) -> Tuple[Optional[Dict], Optional[str]]:
+        try:
+            if self.file_format == "jsonl":
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    return None, "expected a JSON object"
+                return record, None
+
+            values = next(csv.reader([line]))
+            if len(values) != len(self._header):
+                return None, f"expected {len(self._header)} fields, got {len(values)}"
+            return dict(zip(self._header, values)), None
+
+        except (ValueError, csv.Error) as e:
+            return None, f"unparseable row: {e}"
+
+    def _read_chunk(self) -> List[Tuple[int, Optional[Dict], Optional[str]]]:
+        rows = []
+        while len(rows) < self.chunk_size:
+            raw_line = self.file_obj.readline()
+            if not raw_line:
+                break
+
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+
+            if self.file_format == "csv" and self._header is None:
+                self._header = next(csv.reader([line]))
+                continue
+
+            record, error = self._parse_line(line)
+            rows.append((self._row_number, record, error))
+            self._row_number += 1
+        return rows
+
+    def score_next_chunk(self) -> Optional[str]:
+
+        """
+        Method Name :   score_next_chunk
+
+        Description :   This method reads and scores the next chunk of rows.
+
+        Output      :   Newline delimited JSON results of the chunk, or None at end of file
+        """
+        logger.debug("Entered score_next_chunk method of StreamScorer class")
+        try:
+            rows = self._read_chunk()
+            if len(rows) == 0:
+                return None
+
+            results: Dict[int, Dict] = {}
+            parsed = []
+            for row_number, record, error in rows:
+                if error is not None:
+                    results[row_number] = {"row": row_number, "error": error}
+                else:
+                    parsed.append((row_number, record))
+
+            if len(parsed) > 0:
+                df = pd.DataFrame.from_records([record for _, record in parsed])
+                valid_df, errors = CarBatchData.validate_input_data_frame(df)
+                for position, error in errors.items():
+                    row_number = parsed[position][0]
+                    results[row_number] = {"row": row_number, "error": error}
+
+                if len(valid_df) > 0:
+                    try:
+                        predictions = self.predictor.predict(X=valid_df)
+                        for position, prediction in zip(valid_df.index, predictions):
+                            row_number = parsed[position][0]
+                            results[row_number] = {
+                                "row": row_number,
+                                "prediction": round(float(prediction), 2),
+                            }
+
+                    except Exception as e:
+                        for position in valid_df.index:
+                            row_number = parsed[position][0]
+                            results[row_number] = {"row": row_number, "error": f"{e}"}
+
+            logger.debug("Exited score_next_chunk method of StreamScorer class")
+            return "".join(
+                json.dumps(results[row_number]) + "\n" for row_number, _, _ in rows
+            )
+
+        except Exception as e:
+            raise CarException(e, sys) from e
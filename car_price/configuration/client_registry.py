@@ -0,0 +1,132 @@
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, List, Optional
+import boto3
+from botocore.config import Config
+from car_price.constant import (
+    DB_URL,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
+    S3_CONNECT_TIMEOUT,
+    S3_MAX_ATTEMPTS,
+    S3_MAX_POOL_CONNECTIONS,
+    S3_READ_TIMEOUT,
+)
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+# One pooled client of each kind per process, created on first use
+_mongo_client: Optional["MongoClient"] = None
+_boto3_session: Optional[boto3.session.Session] = None
+_s3_client: Optional[Any] = None
+# boto3 resources are not thread-safe, each thread gets its own over the shared session
+_s3_resources: List[Any] = []
+_s3_thread_resources = threading.local()
+# Bumped by close_clients, so threads replace the resources it closed
+_s3_generation = 0
+_client_lock = threading.Lock()
+
+
+def get_mongo_client() -> "MongoClient":
+    """Pooled MongoClient shared by every MongoDBOperation of the process."""
+    global _mongo_client
+    with _client_lock:
+        if _mongo_client is None:
+            # pymongo is only installed with the training extra, not for serving
+            from pymongo import MongoClient
+
+            if DB_URL is None:
+                raise ValueError("MONGODB_URL environment variable is not set")
+            # Connections are opened on the first operation, not at creation
+            _mongo_client = MongoClient(
+                DB_URL,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                connect=False,
+            )
+            logger.info(
+                f"Created MongoDB client with a pool of {MONGO_MAX_POOL_SIZE} connections"
+            )
+        return _mongo_client
+
+
+def _get_boto3_session() -> boto3.session.Session:
+    # The default boto3 session is not safe to create from several threads
+    global _boto3_session
+    if _boto3_session is None:
+        _boto3_session = boto3.session.Session()
+    return _boto3_session
+
+
+def get_s3_config() -> Config:
+    return Config(
+        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+        connect_timeout=S3_CONNECT_TIMEOUT,
+        read_timeout=S3_READ_TIMEOUT,
+        retries={"total_max_attempts": S3_MAX_ATTEMPTS, "mode": "standard"},
+    )
+
+
+def get_s3_client() -> Any:
+    """Thread-safe S3 client shared by every S3Operation of the process."""
+    global _s3_client
+    with _client_lock:
+        if _s3_client is None:
+            _s3_client = _get_boto3_session().client("s3", config=get_s3_config())
+            logger.info(
+                f"Created S3 client with a pool of {S3_MAX_POOL_CONNECTIONS} connections"
+            )
+        return _s3_client
+
+
+def get_s3_resource() -> Any:
+    """S3 resource of the calling thread, created once per thread and process."""
+    generation, resource = getattr(_s3_thread_resources, "resource", (None, None))
+    if resource is None or generation != _s3_generation:
+        with _client_lock:
+            resource = _get_boto3_session().resource("s3", config=get_s3_config())
+            _s3_resources.append(resource)
+            _s3_thread_resources.resource = (_s3_generation, resource)
+    return resource
+
+
+def close_clients() -> None:
+    """Closes the clients of the process, the next use creates new ones."""
+    global _mongo_client, _s3_client, _s3_generation
+    with _client_lock:
+        if _mongo_client is not None:
+            _mongo_client.close()
+            _mongo_client = None
+        if _s3_client is not None:
+            _s3_client.close()
+            _s3_client = None
+        for resource in _s3_resources:
+            resource.meta.client.close()
+        _s3_resources.clear()
+        _s3_generation += 1
+
+
+def _reset_after_fork() -> None:
+    # The sockets of the parent's pools must not be used, nor closed, by a child
+    global _mongo_client, _boto3_session, _s3_client, _s3_resources
+    global _s3_thread_resources, _client_lock
+    _mongo_client = None
+    _boto3_session = None
+    _s3_client = None
+    _s3_resources = []
+    _s3_thread_resources = threading.local()
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,56 @@
+import logging
+import os
+import sys
+from car_price.exception import CarException
+from car_price.utils.main_utils import MainUtils
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+
+class LocalModelOperation:
+    """
+    Serves a model artifact from the local file system with the same interface
+    as S3Operation, for running the app offline.
+    """
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+
+    def get_model_version(
+        self, model_name: str, bucket_name: str, model_dir: str = None
+    ) -> str:
+
+        """
+        Method Name :   get_model_version
+
+        Description :   This method gets a version of the local model file from its modification time and size.
+
+        Output      :   Version of the model file
+        """
+        try:
+            stat = os.stat(self.model_path)
+            return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def load_model(
+        self, model_name: str, bucket_name: str, model_dir: str = None
+    ) -> object:
+
+        """
+        Method Name :   load_model
+
+        Description :   This method loads the model from the local model file.
+
+        Output      :   Model object
+        """
+        logger.info("Entered the load_model method of LocalModelOperation class")
+        try:
+            model = MainUtils.load_object(self.model_path)
+            logger.info("Exited the load_model method of LocalModelOperation class")
+            return model
+
+        except Exception as e:
+            raise CarException(e, sys) from e
@@ -1,22 +1,41 @@
 import sys
-from json import loads
-from typing import Collection
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Collection, Deque, Dict, Iterable, List, Optional, Tuple
+import numpy as np
 from pandas import DataFrame
 from pymongo.database import Database
 import pandas as pd
 from pymongo import MongoClient
-from car_price.constant import DB_URL
+from car_price.configuration.client_registry import get_mongo_client
+from car_price.constant import (
+    DB_URL,
+    MONGO_BATCH_SIZE,
+    MONGO_INSERT_CHUNK_SIZE,
+    MONGO_INSERT_WORKERS,
+    MONGO_READ_PARTITIONS,
+)
 from car_price.exception import CarException
 import logging
 
 # initializing logger
 logger = logging.getLogger(__name__)
 
+NUMERICAL_TYPES = ("int", "float")
+
 
 class MongoDBOperation:
     def __init__(self):
+        if DB_URL is None:
+            raise ValueError("MONGODB_URL environment variable is not set")
+
         self.DB_URL = DB_URL
-        self.client = MongoClient(self.DB_URL)
+
+    @property
+    def client(self) -> MongoClient:
+        # Shared pooled client of the process, see client_registry
+        return get_mongo_client()
 
     def get_database(self, db_name) -> Database:
 
@@ -63,12 +82,143 @@ class MongoDBOperation:
         except Exception as e:
             raise CarException(e, sys) from e
 
-    def get_collection_as_dataframe(self, db_name, collection_name) -> DataFrame:
+    @staticmethod
+    def _to_column_chunk(values: List, column_type: str) -> np.ndarray:
+        if column_type in NUMERICAL_TYPES:
+            try:
+                return np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                return pd.to_numeric(
+                    pd.Series(values, dtype=object), errors="coerce"
+                ).to_numpy(dtype=np.float64)
+        return np.array(values, dtype=object)
+
+    @classmethod
+    def cursor_to_dataframe(
+        cls,
+        documents: Iterable[Dict],
+        column_types: Dict[str, str],
+        batch_size: int = MONGO_BATCH_SIZE,
+    ) -> DataFrame:
+
+        """
+        Method Name :   cursor_to_dataframe
+
+        Description :   This method converts the documents of a cursor into typed column arrays one batch
+                        at a time, so only a single batch of documents is held as Python dicts. Numerical
+                        columns become float64 arrays, int columns without missing values int64 ones.
+
+        Output      :   DataFrame with the columns of column_types
+        """
+        chunks: Dict[str, List[np.ndarray]] = {column: [] for column in column_types}
+        batch: List[Dict] = []
+        documents = iter(documents)
+        while True:
+            batch.clear()
+            for document in documents:
+                batch.append(document)
+                if len(batch) == batch_size:
+                    break
+            if len(batch) == 0:
+                break
+
+            for column, column_type in column_types.items():
+                chunks[column].append(
+                    cls._to_column_chunk(
+                        [document.get(column) for document in batch], column_type
+                    )
+                )
+
+        # Columns are assembled one at a time, freeing their chunks as they go
+        columns = {}
+        for column, column_type in column_types.items():
+            column_chunks = chunks.pop(column)
+            if len(column_chunks) == 0:
+                values = np.empty(
+                    0, dtype=np.float64 if column_type in NUMERICAL_TYPES else object
+                )
+            else:
+                values = np.concatenate(column_chunks)
+            del column_chunks
+
+            if column_type == "int" and not np.isnan(values).any():
+                values = values.astype(np.int64)
+            columns[column] = values
+
+        return pd.DataFrame(columns, copy=False)
+
+    @staticmethod
+    def get_partition_ranges(
+        collection, query: Dict, partitions: int
+    ) -> List[Tuple[Any, Any]]:
+
+        """
+        Method Name :   get_partition_ranges
+
+        Description :   This method splits the documents matching query into _id ranges holding about the
+                        same number of documents, reading the boundaries from the _id index.
+
+        Output      :   List of (lower, upper) _id bounds, None standing for an open bound
+        """
+        n_documents = collection.count_documents(query)
+        bounds: List[Any] = []
+        for idx in range(1, partitions):
+            documents = list(
+                collection.find(query, {"_id": 1})
+                .sort("_id", 1)
+                .skip(idx * n_documents // partitions)
+                .limit(1)
+            )
+            if len(documents) > 0 and (
+                len(bounds) == 0 or documents[0]["_id"] != bounds[-1]
+            ):
+                bounds.append(documents[0]["_id"])
+
+        return list(zip([None] + bounds, bounds + [None]))
+
+    @classmethod
+    def read_partition(
+        cls,
+        collection,
+        query: Dict,
+        projection: Dict,
+        column_types: Dict[str, str],
+        batch_size: int,
+        partition_range: Tuple[Any, Any],
+    ) -> DataFrame:
+        lower, upper = partition_range
+        conditions = [query] if query else []
+        if lower is not None:
+            conditions.append({"_id": {"$gte": lower}})
+        if upper is not None:
+            conditions.append({"_id": {"$lt": upper}})
+
+        cursor = collection.find(
+            {"$and": conditions} if conditions else {},
+            projection,
+            batch_size=batch_size,
+        ).sort("_id", 1)
+        return cls.cursor_to_dataframe(cursor, column_types, batch_size)
+
+    def get_collection_as_dataframe(
+        self,
+        db_name,
+        collection_name,
+        column_types: Optional[Dict[str, str]] = None,
+        batch_size: int = MONGO_BATCH_SIZE,
+        query: Optional[Dict] = None,
+        partitions: int = MONGO_READ_PARTITIONS,
+    ) -> DataFrame:
 
         """
         Method Name :   get_collection_as_dataframe
         
-        Description :   This method is used for converting the selected collection to dataframe
+        Description :   This method is used for converting the selected collection to dataframe. With
+                        column_types, only those fields are projected on the server and the cursor is
+                        streamed into typed columns batch_size documents at a time. query restricts the
+                        documents read, and _id is only read if it is one of the column_types. With more
+                        than one partition, _id ranges are read in parallel threads sharing the client and
+                        concatenated in _id order.
         
         Output      :   A collection is returned from the selected db_name and collection_name
         """
@@ -82,12 +232,52 @@ class MongoDBOperation:
             # Getting the colleciton name
             collection = database.get_collection(name=collection_name)
 
-            # Reading the dataframe and dropping the _id column
-            df = pd.DataFrame(list(collection.find()))
-            if "_id" in df.columns.to_list():
-                df = df.drop(columns=["_id"], axis=1)
+            start_time = time.perf_counter()
+            if column_types is not None and partitions > 1:
+                projection = {column: 1 for column in column_types}
+                projection.setdefault("_id", 0)
+                partition_ranges = self.get_partition_ranges(
+                    collection, query or {}, partitions
+                )
+                with ThreadPoolExecutor(
+                    max_workers=len(partition_ranges), thread_name_prefix="mongo-read"
+                ) as executor:
+                    # map keeps the partitions in _id order whatever finishes first
+                    partition_dfs = list(
+                        executor.map(
+                            lambda partition_range: self.read_partition(
+                                collection,
+                                query or {},
+                                projection,
+                                column_types,
+                                batch_size,
+                                partition_range,
+                            ),
+                            partition_ranges,
+                        )
+                    )
+                df = pd.concat(partition_dfs, ignore_index=True)
+                del partition_dfs
+
+            elif column_types is not None:
+                projection = {column: 1 for column in column_types}
+                projection.setdefault("_id", 0)
+                cursor = collection.find(
+                    query or {}, projection, batch_size=batch_size
+                )
+                df = self.cursor_to_dataframe(cursor, column_types, batch_size)
+
+            else:
+                # Reading the dataframe and dropping the _id column
+                df = pd.DataFrame(list(collection.find(query or {})))
+                if "_id" in df.columns.to_list():
+                    df = df.drop(columns=["_id"])
 
-            logger.info("Converted collection to dataframe")
+            duration = time.perf_counter() - start_time
+            logger.info(
+                f"Converted collection to dataframe, {len(df)} rows in {duration:.2f}s "
+                f"({len(df) / duration if duration > 0 else 0:.0f} rows/s)"
+            )
             logger.info(
                 "Exited get_collection_as_dataframe method of MongoDB_Operation class"
             )
@@ -96,32 +286,94 @@ class MongoDBOperation:
         except Exception as e:
             raise CarException(e, sys) from e
 
-    def insert_dataframe_as_record(self, data_frame, db_name, collection_name) -> None:
+    @staticmethod
+    def dataframe_to_records(data_frame: DataFrame) -> List[Dict]:
+
+        """
+        Method Name :   dataframe_to_records
+
+        Description :   This method converts the dataframe into MongoDB documents column by column, with
+                        numpy values turned into Python ones and missing values into None.
+
+        Output      :   List of documents
+        """
+        columns, column_values = [], []
+        for column in data_frame.columns:
+            series = data_frame[column]
+            if pd.api.types.is_numeric_dtype(series.dtype) and isinstance(
+                series.dtype, np.dtype
+            ):
+                values = series.to_numpy()
+                column_list = values.tolist()
+                if values.dtype.kind == "f":
+                    for row in np.flatnonzero(np.isnan(values)):
+                        column_list[row] = None
+            else:
+                column_list = series.astype(object).where(series.notna(), None).tolist()
+            columns.append(str(column))
+            column_values.append(column_list)
+
+        return [dict(zip(columns, row)) for row in zip(*column_values)]
+
+    def insert_dataframe_as_record(
+        self,
+        data_frame,
+        db_name,
+        collection_name,
+        chunk_size: int = MONGO_INSERT_CHUNK_SIZE,
+        workers: int = MONGO_INSERT_WORKERS,
+    ) -> int:
+
         """
         Method Name :   insert_dataframe_as_record
         
-        Description :   This method inserts the dataframe as record in database collection
+        Description :   This method inserts the dataframe as record in database collection, in unordered
+                        insert_many calls of chunk_size rows, up to workers of them at the same time.
         
-        Output      :   The dataframe is inserted in database collection
+        Output      :   Number of inserted records
         """
         logger.info("Entered insert_dataframe_as_record method of MongoDB_Operation")
 
         try:
-            # Converting dataframe into json
-            records = loads(data_frame.T.to_json()).values()
-            logger.info(f"Converted dataframe to json records")
-
             # Getting the database and collection
             database = self.get_database(db_name)
             collection = database.get_collection(collection_name)
-            logger.info("Inserting records to MongoDB",)
+            logger.info("Inserting records to MongoDB")
+
+            def insert_chunk(start: int) -> int:
+                # Built per chunk, so only the chunks in flight are held as dicts
+                records = self.dataframe_to_records(
+                    data_frame.iloc[start : start + chunk_size]
+                )
+                return len(collection.insert_many(records, ordered=False).inserted_ids)
+
+            start_time = time.perf_counter()
+            starts = range(0, len(data_frame), chunk_size)
+            inserted = 0
+            if workers > 1:
+                with ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="mongo-insert"
+                ) as executor:
+                    in_flight: Deque[Future] = deque()
+                    for start in starts:
+                        if len(in_flight) >= 2 * workers:
+                            inserted += in_flight.popleft().result()
+                        in_flight.append(executor.submit(insert_chunk, start))
+                    while len(in_flight) > 0:
+                        inserted += in_flight.popleft().result()
+            else:
+                for start in starts:
+                    inserted += insert_chunk(start)
 
-            # Inserting data to MongoDB database
-            collection.insert_many(records)
-            logger.info("Inserted records to MongoDB")
+            duration = time.perf_counter() - start_time
+            logger.info(
+                f"Inserted {inserted} records to MongoDB in {duration:.2f}s "
+                f"({inserted / duration if duration > 0 else 0:.0f} rows/s)"
+            )
             logger.info(
                 "Exited the insert_dataframe_as_record method of MongoDB_Operation"
             )
+            return inserted
 
         except Exception as e:
             raise CarException(e, sys) from e
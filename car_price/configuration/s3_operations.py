@@ -2,23 +2,31 @@ import os
 import pickle
 import sys
 from io import StringIO
-from typing import List, Union
+from typing import TYPE_CHECKING, List, Union
 from car_price.constant import *
-import boto3
+from car_price.configuration.client_registry import get_s3_client, get_s3_resource
 from car_price.exception import CarException
 from botocore.exceptions import ClientError
-from mypy_boto3_s3.service_resource import Bucket
 from pandas import DataFrame, read_csv
 import logging
 
+if TYPE_CHECKING:
+    from mypy_boto3_s3.service_resource import Bucket
+
 # initializing logger
 logger = logging.getLogger(__name__)
 
 
 class S3Operation:
-    def __init__(self):
-        self.s3_client = boto3.client("s3")
-        self.s3_resource = boto3.resource("s3")
+    # The client and resource come from the process registry on each use, so an
+    # instance kept across a fork or close_clients never holds a stale connection
+    @property
+    def s3_client(self):
+        return get_s3_client()
+
+    @property
+    def s3_resource(self):
+        return get_s3_resource()
 
     @staticmethod
     def read_object(
@@ -47,7 +55,7 @@ class S3Operation:
         except Exception as e:
             raise CarException(e, sys) from e
 
-    def get_bucket(self, bucket_name: str) -> Bucket:
+    def get_bucket(self, bucket_name: str) -> "Bucket":
 
         """
         Method Name :   get_bucket
@@ -140,6 +148,28 @@ class S3Operation:
         except Exception as e:
             raise CarException(e, sys) from e
 
+    def get_model_version(
+        self, model_name: str, bucket_name: str, model_dir: str = None
+    ) -> str:
+
+        """
+        Method Name :   get_model_version
+
+        Description :   This method gets the ETag of the model_name object in bucket_name bucket without downloading it
+
+        Output      :   ETag of the model object
+        """
+        logger.info("Entered the get_model_version method of S3Operations class")
+
+        try:
+            model_file = model_name if model_dir is None else model_dir + "/" + model_name
+            response = self.s3_client.head_object(Bucket=bucket_name, Key=model_file)
+            logger.info("Exited the get_model_version method of S3Operations class")
+            return response["ETag"].strip('"')
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
     def create_folder(self, folder_name: str, bucket_name: str) -> None:
 
         """
@@ -13,7 +13,38 @@ MODEL_SCHEMA_FILE_PATH = "config/model.yaml"
 
 DB_NAME = "ineuron"
 COLLECTION_NAME = "car"
-DB_URL = environ["MONGODB_URL"]
+# Only needed by the training pipeline, the serving app runs without it
+DB_URL = environ.get("MONGODB_URL")
+
+# Documents fetched per cursor round trip and converted to columns at a time
+MONGO_BATCH_SIZE = int(environ.get("MONGO_BATCH_SIZE", 10000))
+# _id ranges of the collection read in parallel, 1 reads it with a single cursor
+MONGO_READ_PARTITIONS = int(environ.get("MONGO_READ_PARTITIONS", 1))
+# Rows per unordered insert_many call, and calls sent at the same time
+MONGO_INSERT_CHUNK_SIZE = int(environ.get("MONGO_INSERT_CHUNK_SIZE", 10000))
+MONGO_INSERT_WORKERS = int(environ.get("MONGO_INSERT_WORKERS", 1))
+# Pool of the MongoClient shared by the process and its timeouts (a socket timeout
+# of 0 waits for as long as an operation takes)
+MONGO_MAX_POOL_SIZE = int(environ.get("MONGO_MAX_POOL_SIZE", 20))
+MONGO_MAX_IDLE_TIME_MS = int(environ.get("MONGO_MAX_IDLE_TIME_MS", 60000))
+MONGO_CONNECT_TIMEOUT_MS = int(environ.get("MONGO_CONNECT_TIMEOUT_MS", 5000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(
+    environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 10000)
+)
+MONGO_SOCKET_TIMEOUT_MS = int(environ.get("MONGO_SOCKET_TIMEOUT_MS", 0))
+# Opt-in: ingestion fetches the documents past the watermark and merges them into a
+# local Parquet snapshot, a full refresh re-reads the whole collection. Both can be
+# set per training job by POST /train
+DATA_INGESTION_INCREMENTAL = (
+    environ.get("DATA_INGESTION_INCREMENTAL", "false").lower() == "true"
+)
+DATA_INGESTION_FULL_REFRESH = (
+    environ.get("DATA_INGESTION_FULL_REFRESH", "false").lower() == "true"
+)
+MONGO_WATERMARK_FIELD = environ.get("MONGO_WATERMARK_FIELD", "_id")
+DATA_SNAPSHOT_DIR = environ.get(
+    "DATA_SNAPSHOT_DIR", os.path.join(from_root(), "artifacts", "snapshots")
+)
 
 TEST_SIZE = 0.2
 
@@ -22,6 +53,10 @@ MODEL_CONFIG_FILE = "config/model.yaml"
 ARTIFACTS_DIR = os.path.join(from_root(), "artifacts", TIMESTAMP)
 LOGS_DIR = "logs"
 LOGS_FILE_NAME = "car_price.log"
+LOG_LEVEL = environ.get("LOG_LEVEL", "DEBUG").upper()
+# Share of per-request log records kept, and their cap per message and second (0 disables)
+LOG_SAMPLE_RATE = float(environ.get("LOG_SAMPLE_RATE", 1.0))
+LOG_RATE_LIMIT = float(environ.get("LOG_RATE_LIMIT", 0))
 
 DATA_INGESTION_ARTIFACTS_DIR = "DataIngestionArtifacts"
 DATA_INGESTION_TRAIN_DIR = "Train"
@@ -38,15 +73,75 @@ TRANSFORMED_TEST_DATA_DIR = "TransformedTest"
 TRANSFORMED_TRAIN_DATA_FILE_NAME = "transformed_train_data.npz"
 TRANSFORMED_TEST_DATA_FILE_NAME = "transformed_test_data.npz"
 PREPROCESSOR_OBJECT_FILE_NAME = "car_price_preprocessor.pkl"
+FEATURE_ENCODER_FILE_NAME = "car_price_feature_encoder.pkl"
 
 MODEL_TRAINER_ARTIFACTS_DIR = "ModelTrainerArtifacts"
 MODEL_FILE_NAME = "car_price_model.pkl"
 
 BUCKET_NAME = "car-price-io-files"
 S3_MODEL_NAME = "car_price_model.pkl"
+# Pool of the S3 client shared by the process, its timeouts in seconds and attempts
+S3_MAX_POOL_CONNECTIONS = int(environ.get("S3_MAX_POOL_CONNECTIONS", 20))
+S3_CONNECT_TIMEOUT = float(environ.get("S3_CONNECT_TIMEOUT", 5))
+S3_READ_TIMEOUT = float(environ.get("S3_READ_TIMEOUT", 60))
+S3_MAX_ATTEMPTS = int(environ.get("S3_MAX_ATTEMPTS", 3))
 
 
 MODEL_SAVE_FORMAT = ".pkl"
 
 APP_HOST = "0.0.0.0"
 APP_PORT = 8080
+
+FORM_PAGE_CACHE_SIZE = 16
+PREDICTION_MAX_BATCH_SIZE = int(environ.get("PREDICTION_MAX_BATCH_SIZE", 1000))
+PREDICTION_ARROW_MAX_ROWS = int(environ.get("PREDICTION_ARROW_MAX_ROWS", 1000000))
+PREDICTION_STREAM_CHUNK_SIZE = int(environ.get("PREDICTION_STREAM_CHUNK_SIZE", 1000))
+PREDICTION_STREAM_SPOOL_SIZE = int(
+    environ.get("PREDICTION_STREAM_SPOOL_SIZE", 8 * 1024 * 1024)
+)
+BATCH_PREDICTION_CHUNK_SIZE = int(environ.get("BATCH_PREDICTION_CHUNK_SIZE", 10000))
+MODEL_CACHE_REFRESH_INTERVAL = int(environ.get("MODEL_CACHE_REFRESH_INTERVAL", 300))
+# Serve a local model artifact instead of the S3 one, e.g. for offline load tests
+LOCAL_MODEL_PATH = environ.get("LOCAL_MODEL_PATH")
+
+FEATURE_ENCODER_FAST_PATH = (
+    environ.get("FEATURE_ENCODER_FAST_PATH", "false").lower() == "true"
+)
+
+PREDICTION_CACHE_ENABLED = (
+    environ.get("PREDICTION_CACHE_ENABLED", "false").lower() == "true"
+)
+PREDICTION_CACHE_MAX_SIZE = int(environ.get("PREDICTION_CACHE_MAX_SIZE", 10000))
+PREDICTION_CACHE_TTL = float(environ.get("PREDICTION_CACHE_TTL", 3600))
+
+REQUEST_COALESCING_ENABLED = (
+    environ.get("REQUEST_COALESCING_ENABLED", "true").lower() == "true"
+)
+
+# Prediction requests served at once (0 disables admission control) and queued
+# for a slot, and the deadline in seconds of a prediction request (0 disables it)
+ADMISSION_MAX_CONCURRENCY = int(environ.get("ADMISSION_MAX_CONCURRENCY", 32))
+ADMISSION_MAX_QUEUE_DEPTH = int(environ.get("ADMISSION_MAX_QUEUE_DEPTH", 64))
+ADMISSION_RETRY_AFTER = int(environ.get("ADMISSION_RETRY_AFTER", 1))
+PREDICTION_REQUEST_TIMEOUT = float(environ.get("PREDICTION_REQUEST_TIMEOUT", 10))
+
+MICRO_BATCH_ENABLED = environ.get("MICRO_BATCH_ENABLED", "false").lower() == "true"
+MICRO_BATCH_MAX_SIZE = int(environ.get("MICRO_BATCH_MAX_SIZE", 32))
+MICRO_BATCH_MAX_WAIT_MS = float(environ.get("MICRO_BATCH_MAX_WAIT_MS", 5))
+
+INFERENCE_POOL_SIZE = int(environ.get("INFERENCE_POOL_SIZE", 4))
+TRAINING_POOL_SIZE = int(environ.get("TRAINING_POOL_SIZE", 1))
+TRAINING_JOB_HISTORY_SIZE = int(environ.get("TRAINING_JOB_HISTORY_SIZE", 50))
+# Lock file that keeps training single-flight across the processes of a host, the
+# job status files are written next to it and polled by the other workers
+TRAINING_JOB_POLL_INTERVAL = float(environ.get("TRAINING_JOB_POLL_INTERVAL", 1))
+TRAINING_LOCK_FILE = environ.get(
+    "TRAINING_LOCK_FILE", os.path.join(from_root(), "artifacts", "training.lock")
+)
+
+MODEL_WARMUP_ROUNDS = int(environ.get("MODEL_WARMUP_ROUNDS", 3))
+MODEL_WARMUP_BATCH_SIZE = int(environ.get("MODEL_WARMUP_BATCH_SIZE", 16))
+MODEL_WARMUP_RETRY_INTERVAL = int(environ.get("MODEL_WARMUP_RETRY_INTERVAL", 10))
+
+PREFORK_WORKERS = int(environ.get("PREFORK_WORKERS", os.cpu_count() or 1))
+PREFORK_READY_TIMEOUT = int(environ.get("PREFORK_READY_TIMEOUT", 60))
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 # Data Ingestion Artifacts
 @dataclass
@@ -20,6 +21,7 @@ class DataTransformationArtifacts:
     transformed_object_file_path: str
     transformed_train_file_path: str
     transformed_test_file_path: str
+    feature_encoder_file_path: Optional[str] = None
 
 
 # Model Trainer Artifacts
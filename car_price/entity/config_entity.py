@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from from_root import from_root
 import os
+from typing import Optional
 from car_price.configuration.s3_operations import S3Operation
 from car_price.utils.main_utils import MainUtils
 from car_price.constant import *
@@ -8,12 +9,26 @@ from car_price.constant import *
 # Data Ingestion Configurations
 @dataclass
 class DataIngestionConfig:
-    def __init__(self):
+    def __init__(
+        self, incremental: Optional[bool] = None, full_refresh: Optional[bool] = None
+    ):
         self.UTILS = MainUtils()
         self.SCHEMA_CONFIG = self.UTILS.read_yaml_file(filename=SCHEMA_FILE_PATH)
         self.DB_NAME = DB_NAME
         self.COLLECTION_NAME = COLLECTION_NAME
         self.DROP_COLS = list(self.SCHEMA_CONFIG["drop_columns"])
+        self.COLUMN_TYPES = dict(self.SCHEMA_CONFIG["columns"])
+        self.BATCH_SIZE = MONGO_BATCH_SIZE
+        self.READ_PARTITIONS = MONGO_READ_PARTITIONS
+        # Per-job options override the environment defaults
+        self.INCREMENTAL = (
+            DATA_INGESTION_INCREMENTAL if incremental is None else incremental
+        )
+        self.FULL_REFRESH = (
+            DATA_INGESTION_FULL_REFRESH if full_refresh is None else full_refresh
+        )
+        self.WATERMARK_FIELD = MONGO_WATERMARK_FIELD
+        self.SNAPSHOT_DIR = DATA_SNAPSHOT_DIR
         self.DATA_INGESTION_ARTIFCATS_DIR: str = os.path.join(
             from_root(), ARTIFACTS_DIR, DATA_INGESTION_ARTIFACTS_DIR
         )
@@ -78,6 +93,12 @@ class DataTransformationConfig:
             DATA_TRANSFORMATION_ARTIFCATS_DIR,
             PREPROCESSOR_OBJECT_FILE_NAME,
         )
+        self.FEATURE_ENCODER_FILE_PATH = os.path.join(
+            from_root(),
+            ARTIFACTS_DIR,
+            DATA_TRANSFORMATION_ARTIFCATS_DIR,
+            FEATURE_ENCODER_FILE_NAME,
+        )
 
 
 # Model Trainer Configurations
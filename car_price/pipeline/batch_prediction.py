@@ -0,0 +1,256 @@
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from car_price.components.model_predictor import CarBatchData
+from car_price.configuration.s3_operations import S3Operation
+from car_price.constant import BATCH_PREDICTION_CHUNK_SIZE, BUCKET_NAME, MODEL_FILE_NAME
+from car_price.exception import CarException
+from car_price.utils.main_utils import MainUtils
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+PREDICTION_COLUMN = "predicted_selling_price"
+ERROR_COLUMN = "error"
+
+# Model loaded once per worker process by _init_worker
+_worker_model = None
+
+
+def _init_worker(model_path: Optional[str], bucket_name: str) -> None:
+    global _worker_model
+    if model_path is not None:
+        _worker_model = MainUtils.load_object(model_path)
+    else:
+        _worker_model = S3Operation().load_model(MODEL_FILE_NAME, bucket_name)
+
+
+def _score_chunk(chunk_index: int, df: DataFrame) -> Tuple[int, DataFrame, float]:
+    start_time = time.perf_counter()
+    valid_df, errors = CarBatchData.validate_input_data_frame(df)
+
+    predictions = np.full(len(df), np.nan)
+    if len(valid_df) > 0:
+        predictions[valid_df.index.to_numpy()] = _worker_model.predict(valid_df)
+
+    result = df.reset_index(drop=True)
+    result[PREDICTION_COLUMN] = np.round(predictions, 2)
+    result[ERROR_COLUMN] = pd.Series(errors, index=list(errors), dtype=object).reindex(
+        result.index
+    )
+    return chunk_index, result, time.perf_counter() - start_time
+
+
+def get_file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    return "csv"
+
+
+def get_available_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class BatchPrediction:
+    def __init__(
+        self,
+        input_path: str,
+        output_path: str,
+        model_path: Optional[str] = None,
+        bucket_name: str = BUCKET_NAME,
+        chunk_size: int = BATCH_PREDICTION_CHUNK_SIZE,
+        workers: Optional[int] = None,
+    ):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.model_path = model_path
+        self.bucket_name = bucket_name
+        self.chunk_size = chunk_size
+        self.workers = workers if workers is not None else get_available_cores()
+        self._parquet_writer = None
+
+    def read_chunks(self) -> Iterator[DataFrame]:
+        """
+        Method Name :   read_chunks
+
+        Description :   This method reads the input file in chunks of chunk_size rows.
+
+        Output      :   Iterator of DataFrames
+        """
+        file_format = get_file_format(self.input_path)
+        if file_format == "csv":
+            yield from pd.read_csv(self.input_path, chunksize=self.chunk_size)
+
+        elif file_format == "jsonl":
+            yield from pd.read_json(
+                self.input_path, lines=True, chunksize=self.chunk_size
+            )
+
+        else:
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(self.input_path)
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_size):
+                yield batch.to_pandas()
+
+    def write_chunk(self, df: DataFrame, is_first: bool) -> None:
+        file_format = get_file_format(self.output_path)
+        if file_format == "csv":
+            df.to_csv(
+                self.output_path,
+                mode="w" if is_first else "a",
+                header=is_first,
+                index=False,
+            )
+
+        elif file_format == "jsonl":
+            lines = df.to_json(orient="records", lines=True)
+            with open(self.output_path, "w" if is_first else "a") as f:
+                f.write(lines if lines.endswith("\n") else lines + "\n")
+
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Every chunk must share the schema of the first one, so schema numerical
+            # columns are written as floats and everything non-numeric as strings
+            numerical_columns = CarBatchData.get_schema_config()["numerical_columns"]
+            df = df.copy()
+            for column in df.columns:
+                if column in numerical_columns:
+                    df[column] = pd.to_numeric(df[column], errors="coerce")
+                elif not pd.api.types.is_numeric_dtype(df[column]):
+                    df[column] = df[column].where(
+                        df[column].isna(), df[column].astype(str)
+                    )
+
+            if self._parquet_writer is None:
+                fields = []
+                for column in df.columns:
+                    if column in numerical_columns:
+                        arrow_type = pa.float64()
+                    elif pd.api.types.is_numeric_dtype(df[column]):
+                        arrow_type = pa.from_numpy_dtype(df[column].dtype)
+                    else:
+                        arrow_type = pa.string()
+                    fields.append(pa.field(column, arrow_type))
+                self._parquet_writer = pq.ParquetWriter(
+                    self.output_path, pa.schema(fields)
+                )
+            self._parquet_writer.write_table(
+                pa.Table.from_pandas(
+                    df, schema=self._parquet_writer.schema, preserve_index=False
+                )
+            )
+
+    def run(self) -> Dict:
+        """
+        Method Name :   run
+
+        Description :   This method scores the input file over a process pool and writes the
+                        predictions to the output file in input order.
+
+        Output      :   Summary with row count, elapsed time and per-chunk timings
+        """
+        logger.info("Entered run method of BatchPrediction class")
+        try:
+            start_time = time.perf_counter()
+            chunk_timings: List[float] = []
+            total_rows, failed_rows = 0, 0
+
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.model_path, self.bucket_name),
+            ) as executor:
+                # Bounded window of in-flight chunks, collected in submission order
+                pending = deque()
+                chunks = enumerate(self.read_chunks())
+                exhausted = False
+                while True:
+                    while not exhausted and len(pending) < 2 * self.workers:
+                        try:
+                            chunk_index, chunk = next(chunks)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        pending.append(
+                            executor.submit(_score_chunk, chunk_index, chunk)
+                        )
+
+                    if len(pending) == 0:
+                        break
+
+                    chunk_index, result, elapsed = pending.popleft().result()
+                    self.write_chunk(result, is_first=chunk_index == 0)
+                    chunk_timings.append(elapsed)
+                    total_rows += len(result)
+                    failed_rows += int(result[ERROR_COLUMN].notna().sum())
+
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+
+            elapsed = time.perf_counter() - start_time
+            logger.info("Exited run method of BatchPrediction class")
+            return {
+                "rows": total_rows,
+                "failed_rows": failed_rows,
+                "elapsed_seconds": elapsed,
+                "rows_per_second": total_rows / elapsed if elapsed > 0 else 0.0,
+                "chunk_seconds": chunk_timings,
+            }
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Score a CSV, Parquet or JSONL file of cars with the car price model"
+    )
+    parser.add_argument("input", help="input file (.csv, .parquet or .jsonl)")
+    parser.add_argument("output", help="output file (.csv, .parquet or .jsonl)")
+    parser.add_argument(
+        "--model-path", help="local model artifact, the S3 model is used if omitted"
+    )
+    parser.add_argument("--bucket-name", default=BUCKET_NAME)
+    parser.add_argument("--chunk-size", type=int, default=BATCH_PREDICTION_CHUNK_SIZE)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="defaults to the available cores"
+    )
+    args = parser.parse_args(argv)
+
+    batch_prediction = BatchPrediction(
+        input_path=args.input,
+        output_path=args.output,
+        model_path=args.model_path,
+        bucket_name=args.bucket_name,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    summary = batch_prediction.run()
+
+    for chunk_index, chunk_seconds in enumerate(summary["chunk_seconds"]):
+        print(f"chunk {chunk_index}: {chunk_seconds:.3f}s")
+    print(
+        f"Scored {summary['rows']} rows ({summary['failed_rows']} failed) in "
+        f"{summary['elapsed_seconds']:.2f}s, {summary['rows_per_second']:.0f} rows/s "
+        f"with {batch_prediction.workers} workers"
+    )
+
+
+if __name__ == "__main__":
+    main()
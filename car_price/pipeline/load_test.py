@@ -0,0 +1,343 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from car_price.constant import CONFIG_FILE_PATH, SCHEMA_FILE_PATH
+from car_price.exception import CarException
+from car_price.utils.main_utils import MainUtils
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+ENDPOINTS = ("predict", "batch")
+
+
+def get_percentile(sorted_values: List[float], percentile: float) -> float:
+    if len(sorted_values) == 0:
+        return 0.0
+    rank = max(int(round(percentile / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def generate_records(seed: int = 0) -> Iterator[Dict]:
+
+    """
+    Method Name :   generate_records
+
+    Description :   This method generates an endless stream of synthetic car records from the columns of
+                    schema.yaml and the car_list of config.yaml.
+
+    Output      :   Iterator of car records
+    """
+    utils = MainUtils()
+    schema_config = utils.read_yaml_file(filename=SCHEMA_FILE_PATH)
+    car_list = utils.read_yaml_file(filename=CONFIG_FILE_PATH)["car_list"]
+    columns = schema_config["columns"]
+    feature_columns = [
+        column
+        for column in columns
+        if column != schema_config["target_column"]
+        and column not in schema_config["drop_columns"]
+    ]
+
+    rng = random.Random(seed)
+    while True:
+        record = {}
+        for column in feature_columns:
+            if column == "car_name":
+                record[column] = rng.choice(car_list)
+            elif columns[column] == "int":
+                record[column] = rng.randint(1, 20)
+            elif columns[column] == "float":
+                record[column] = round(rng.uniform(1, 200), 1)
+            else:
+                record[column] = f"{column}_{rng.randint(0, 2)}"
+        yield record
+
+
+def read_records(path: str) -> List[Dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class LoadTest:
+    """
+    Replays car records against the app at a target concurrency, and
+    optionally a target request rate.
+
+    With a rate, requests are issued on a fixed schedule and latency is
+    measured from the scheduled send time, so queueing in the load generator
+    is counted instead of hidden. Without one, `concurrency` workers send
+    requests back to back.
+    """
+
+    def __init__(
+        self,
+        records: Iterator[Dict],
+        n_requests: int = 1000,
+        concurrency: int = 16,
+        rate: Optional[float] = None,
+        endpoint: str = "predict",
+        batch_size: int = 1,
+        url: Optional[str] = None,
+        app_path: str = "app:app",
+        model_path: Optional[str] = None,
+        timeout: float = 30.0,
+    ):
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unsupported endpoint {endpoint}")
+
+        self.records = records
+        self.n_requests = n_requests
+        self.concurrency = concurrency
+        self.rate = rate
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.url = url
+        self.app_path = app_path
+        self.model_path = model_path
+        self.timeout = timeout
+
+        self._latencies: List[float] = []
+        self._status_codes: Counter = Counter()
+        self._errors = 0
+
+    def _next_request(self) -> Tuple[str, Dict]:
+        record = next(self.records)
+        # Replayed lines may carry their own path and body
+        if "path" in record:
+            body = {key: record[key] for key in ("json", "data") if key in record}
+            return record["path"], body
+
+        if self.endpoint == "batch":
+            records = [record] + [
+                next(self.records) for _ in range(self.batch_size - 1)
+            ]
+            return "/predict/batch", {"json": records}
+        return "/predict", {"data": {key: str(value) for key, value in record.items()}}
+
+    async def _send(self, client: object, scheduled_at: float) -> None:
+        path, body = self._next_request()
+        try:
+            response = await client.post(path, **body)
+            failed = response.status_code >= 400
+            if not failed and response.headers.get("content-type", "").startswith(
+                "application/json"
+            ):
+                payload = response.json()
+                failed = isinstance(payload, dict) and payload.get("status") is False
+            self._status_codes[str(response.status_code)] += 1
+
+        except Exception as e:
+            logger.debug("Load test request failed: %s", e)
+            self._status_codes[type(e).__name__] += 1
+            failed = True
+
+        self._latencies.append(time.perf_counter() - scheduled_at)
+        if failed:
+            self._errors += 1
+
+    async def _run_closed_loop(self, client: object) -> None:
+        remaining = iter(range(self.n_requests))
+
+        async def worker() -> None:
+            for _ in remaining:
+                await self._send(client, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def _run_open_loop(self, client: object) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start_time = time.perf_counter()
+
+        async def send(scheduled_at: float) -> None:
+            async with semaphore:
+                await self._send(client, scheduled_at)
+
+        tasks = []
+        for idx in range(self.n_requests):
+            scheduled_at = start_time + idx / self.rate
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(send(scheduled_at)))
+        await asyncio.gather(*tasks)
+
+    async def _run_with_client(self, client: object) -> float:
+        start_time = time.perf_counter()
+        if self.rate is not None:
+            await self._run_open_loop(client)
+        else:
+            await self._run_closed_loop(client)
+        return time.perf_counter() - start_time
+
+    async def _wait_until_ready(self, client: object, timeout: float = 120) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/readyz")).status_code == 200:
+                    return
+            except Exception:
+                pass
+            await asyncio.sleep(0.5)
+        raise TimeoutError(f"App was not ready after {timeout}s")
+
+    async def run_async(self) -> Dict:
+        import httpx
+
+        if self.url is not None:
+            async with httpx.AsyncClient(
+                base_url=self.url, timeout=self.timeout
+            ) as client:
+                await self._wait_until_ready(client)
+                elapsed = await self._run_with_client(client)
+        else:
+            from uvicorn.importer import import_from_string
+            from car_price.components.model_cache import ModelCache
+
+            if self.model_path is not None:
+                ModelCache.set_instance(ModelCache(model_path=self.model_path))
+            app = import_from_string(self.app_path)
+
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(
+                    transport=transport,
+                    base_url="http://load-test",
+                    timeout=self.timeout,
+                ) as client:
+                    await self._wait_until_ready(client)
+                    elapsed = await self._run_with_client(client)
+
+        return self.get_summary(elapsed)
+
+    def run(self) -> Dict:
+        """
+        Method Name :   run
+
+        Description :   This method sends the requests and measures their latency.
+
+        Output      :   Summary with throughput, latency percentiles and error rate
+        """
+        logger.info("Entered run method of LoadTest class")
+        try:
+            summary = asyncio.run(self.run_async())
+            logger.info("Exited run method of LoadTest class")
+            return summary
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def get_summary(self, elapsed: float) -> Dict:
+        latencies = sorted(self._latencies)
+        n_requests = len(latencies)
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "git_commit": get_git_commit(),
+            "config": {
+                "target": self.url if self.url is not None else "in-process",
+                "endpoint": self.endpoint,
+                "batch_size": self.batch_size,
+                "requests": self.n_requests,
+                "concurrency": self.concurrency,
+                "rate": self.rate,
+            },
+            "requests": n_requests,
+            "errors": self._errors,
+            "error_rate": self._errors / n_requests if n_requests > 0 else 0.0,
+            "elapsed_seconds": elapsed,
+            "throughput_rps": n_requests / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {
+                "mean": 1000 * sum(latencies) / n_requests if n_requests > 0 else 0.0,
+                "p50": 1000 * get_percentile(latencies, 50),
+                "p95": 1000 * get_percentile(latencies, 95),
+                "p99": 1000 * get_percentile(latencies, 99),
+                "max": 1000 * latencies[-1] if n_requests > 0 else 0.0,
+            },
+            "status_codes": dict(self._status_codes),
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Load test the car price app and report throughput and tail latency"
+    )
+    parser.add_argument(
+        "--input",
+        help="JSONL file of car records to replay, synthetic records are used if omitted",
+    )
+    parser.add_argument(
+        "--url", help="base url of a running app, the app is run in-process if omitted"
+    )
+    parser.add_argument(
+        "--app", default="app:app", help="import path of the app run in-process"
+    )
+    parser.add_argument(
+        "--model-path",
+        help="local model artifact served in-process instead of the S3 model",
+    )
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="predict")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--rate", type=float, default=None, help="target requests per second"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load_test_result.json")
+    args = parser.parse_args(argv)
+
+    # app.py is imported from the working directory, like uvicorn does
+    sys.path.insert(0, os.getcwd())
+    if args.input is not None:
+        replayed = read_records(args.input)
+        records = (replayed[idx % len(replayed)] for idx in range(sys.maxsize))
+    else:
+        records = generate_records(args.seed)
+
+    summary = LoadTest(
+        records=records,
+        n_requests=args.requests,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        endpoint=args.endpoint,
+        batch_size=args.batch_size,
+        url=args.url,
+        app_path=args.app,
+        model_path=args.model_path,
+    ).run()
+
+    with open(args.output, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    latency = summary["latency_ms"]
+    print(
+        f"{summary['requests']} requests in {summary['elapsed_seconds']:.2f}s, "
+        f"{summary['throughput_rps']:.1f} req/s, error rate {summary['error_rate']:.2%}"
+    )
+    print(
+        f"latency p50 {latency['p50']:.1f}ms p95 {latency['p95']:.1f}ms "
+        f"p99 {latency['p99']:.1f}ms max {latency['max']:.1f}ms"
+    )
+    print(f"Result written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import argparse
+import gc
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+import uvicorn
+from uvicorn.importer import import_from_string
+from car_price.components.model_cache import ModelCache
+from car_price.components.model_warmer import ModelWarmer
+from car_price.constant import *
+from car_price.exception import CarException
+from car_price.utils.main_utils import MainUtils
+from car_price.utils.process_memory import get_fleet_memory, get_process_memory
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+
+class _WorkerServer(uvicorn.Server):
+    """Uvicorn server that tells the parent through a pipe once it serves requests."""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            os.write(self.ready_fd, b"1")
+        os.close(self.ready_fd)
+
+
+class PreforkServer:
+    """
+    Serves the FastAPI app from N forked Uvicorn workers sharing one model.
+
+    The parent process loads and warms the model, freezes the garbage collector
+    so the model objects are never written to by a collection, then binds the
+    listening socket and forks the workers. The model pages stay shared
+    copy-on-write between the workers, which never reload the model on their own.
+
+    The parent polls the model version every `refresh_interval` seconds, and on
+    SIGHUP, and replaces the workers one at a time when a new model is loaded.
+    SIGUSR1 prints the memory use of the worker fleet.
+    """
+
+    def __init__(
+        self,
+        app_path: str = "app:app",
+        host: str = APP_HOST,
+        port: int = APP_PORT,
+        workers: int = PREFORK_WORKERS,
+        refresh_interval: int = MODEL_CACHE_REFRESH_INTERVAL,
+        ready_timeout: int = PREFORK_READY_TIMEOUT,
+    ):
+        self.app_path = app_path
+        self.host = host
+        self.port = port
+        self.n_workers = workers
+        self.refresh_interval = refresh_interval
+        self.ready_timeout = ready_timeout
+
+        self.app = None
+        self.socket: Optional[socket.socket] = None
+        # worker pid -> generation of the model it was forked with
+        self.workers: Dict[int, int] = {}
+        self.generation = 0
+
+        self._should_exit = False
+        self._reload_requested = False
+        self._report_requested = False
+
+    def _load_model(self, force: bool = False) -> bool:
+
+        """
+        Method Name :   _load_model
+
+        Description :   This method loads and warms the model in the parent process and freezes it
+                        in the permanent generation of the garbage collector.
+
+        Output      :   True if a new model was loaded else False
+        """
+        logger.info("Entered _load_model method of PreforkServer class")
+        try:
+            model_cache = ModelCache.get_instance()
+            # Workers must keep the model forked from the parent
+            model_cache.refresh_interval = -1
+            model_warmer = ModelWarmer(car_list=MainUtils().get_car_list())
+            model_cache.sanity_check = model_warmer.check_model
+
+            gc.unfreeze()
+            loaded = model_cache.refresh()
+            if loaded or force:
+                model_warmer.warm_up()
+
+            gc.collect()
+            gc.freeze()
+            logger.info(f"Parent serves model version {model_cache.version}")
+            logger.info("Exited _load_model method of PreforkServer class")
+            return loaded
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def _bind_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _run_worker(self, ready_fd: int) -> None:
+        for signum in (signal.SIGHUP, signal.SIGUSR1, signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, signal.SIG_DFL)
+
+        config = uvicorn.Config(self.app, log_config=None, lifespan="on")
+        _WorkerServer(config, ready_fd).run(sockets=[self.socket])
+
+    def _spawn_worker(self) -> Tuple[int, bool]:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            exit_code = 0
+            try:
+                self._run_worker(write_fd)
+
+            except BaseException as e:
+                logger.error(f"Worker {os.getpid()} failed: {e}")
+                exit_code = 1
+
+            finally:
+                os._exit(exit_code)
+
+        os.close(write_fd)
+        try:
+            readable, _, _ = select.select([read_fd], [], [], self.ready_timeout)
+            ready = len(readable) > 0 and os.read(read_fd, 1) == b"1"
+        finally:
+            os.close(read_fd)
+
+        self.workers[pid] = self.generation
+        logger.info(
+            f"Started worker {pid} (generation {self.generation}, ready {ready})"
+        )
+        return pid, ready
+
+    def _stop_worker(self, pid: int, timeout: float = 30) -> None:
+        self.workers.pop(pid, None)
+        try:
+            os.kill(pid, signal.SIGTERM)
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                    return
+                time.sleep(0.1)
+
+            logger.warning(f"Worker {pid} did not exit in {timeout}s, killing it")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+        except ChildProcessError:
+            pass
+
+    def _reap_workers(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            if self.workers.pop(pid, None) is not None and not self._should_exit:
+                logger.error(f"Worker {pid} exited with status {status}, replacing it")
+                self._spawn_worker()
+
+    def reload(self, force: bool = False) -> bool:
+
+        """
+        Method Name :   reload
+
+        Description :   This method loads the new model in the parent, then replaces the workers one at a
+                        time, each new worker serving before an old one is stopped.
+
+        Output      :   True if the workers were replaced else False
+        """
+        logger.info("Entered reload method of PreforkServer class")
+        try:
+            if not self._load_model(force=force) and not force:
+                return False
+
+            self.generation += 1
+            old_workers = [
+                pid
+                for pid, generation in self.workers.items()
+                if generation < self.generation
+            ]
+            for old_pid in old_workers:
+                new_pid, ready = self._spawn_worker()
+                if not ready:
+                    logger.error(
+                        f"Worker {new_pid} did not become ready, keeping the remaining old workers"
+                    )
+                    self._stop_worker(new_pid)
+                    return False
+                self._stop_worker(old_pid)
+
+            self.log_memory_report()
+            logger.info("Exited reload method of PreforkServer class")
+            return True
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def get_memory_report(self) -> Dict:
+        report = get_fleet_memory(sorted(self.workers))
+        report["parent"] = get_process_memory()
+        report["workers"] = len(self.workers)
+        report["model_version"] = ModelCache.get_instance().version
+        return report
+
+    def log_memory_report(self) -> None:
+        report = self.get_memory_report()
+        logger.info(f"Worker fleet memory: {json.dumps(report)}")
+        print(json.dumps(report), flush=True)
+
+    def _handle_signal(self, signum: int, frame: object) -> None:
+        if signum == signal.SIGHUP:
+            self._reload_requested = True
+        elif signum == signal.SIGUSR1:
+            self._report_requested = True
+        else:
+            self._should_exit = True
+
+    def run(self) -> None:
+
+        """
+        Method Name :   run
+
+        Description :   This method loads the model, forks the workers and supervises them until
+                        SIGTERM or SIGINT.
+
+        Output      :   None
+        """
+        logger.info("Entered run method of PreforkServer class")
+        try:
+            self.app = import_from_string(self.app_path)
+            self._load_model()
+            self.socket = self._bind_socket()
+
+            for signum in (
+                signal.SIGHUP,
+                signal.SIGUSR1,
+                signal.SIGINT,
+                signal.SIGTERM,
+            ):
+                signal.signal(signum, self._handle_signal)
+
+            for _ in range(self.n_workers):
+                self._spawn_worker()
+            self.log_memory_report()
+
+            last_refresh = time.monotonic()
+            while not self._should_exit:
+                time.sleep(1)
+                self._reap_workers()
+
+                refresh_due = (
+                    self.refresh_interval > 0
+                    and time.monotonic() - last_refresh >= self.refresh_interval
+                )
+                if self._reload_requested or refresh_due:
+                    force, self._reload_requested = self._reload_requested, False
+                    last_refresh = time.monotonic()
+                    try:
+                        self.reload(force=force)
+                    except Exception as e:
+                        logger.error(
+                            f"Model reload failed, keeping current workers: {e}"
+                        )
+
+                if self._report_requested:
+                    self._report_requested = False
+                    self.log_memory_report()
+
+            for pid in list(self.workers):
+                self._stop_worker(pid)
+            self.socket.close()
+            logger.info("Exited run method of PreforkServer class")
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve the car price app from pre-forked workers sharing one model"
+    )
+    parser.add_argument("--app", default="app:app", help="import path of the app")
+    parser.add_argument("--host", default=APP_HOST)
+    parser.add_argument("--port", type=int, default=APP_PORT)
+    parser.add_argument("--workers", type=int, default=PREFORK_WORKERS)
+    parser.add_argument(
+        "--refresh-interval",
+        type=int,
+        default=MODEL_CACHE_REFRESH_INTERVAL,
+        help="seconds between model version checks, 0 disables them",
+    )
+    args = parser.parse_args(argv)
+
+    # app.py is imported from the working directory, like uvicorn does
+    sys.path.insert(0, os.getcwd())
+    PreforkServer(
+        app_path=args.app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        refresh_interval=args.refresh_interval,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 import sys
+import time
+from typing import Any, Callable, Optional
+from car_price.configuration.client_registry import close_clients
 from car_price.configuration.mongo_operations import MongoDBOperation
 from car_price.entity.artifacts_entity import (
     DataIngestionArtifacts,
@@ -31,8 +34,16 @@ logger = logging.getLogger(__name__)
 
 
 class TrainPipeline:
-    def __init__(self):
-        self.data_ingestion_config = DataIngestionConfig()
+    def __init__(
+        self,
+        stage_callback: Optional[Callable[[str, str, float], None]] = None,
+        incremental: Optional[bool] = None,
+        full_refresh: Optional[bool] = None,
+    ):
+        self.stage_callback = stage_callback
+        self.data_ingestion_config = DataIngestionConfig(
+            incremental=incremental, full_refresh=full_refresh
+        )
         self.data_validation_config = DataValidationConfig()
         self.data_transformation_config = DataTransformationConfig()
         self.model_trainer_config = ModelTrainerConfig()
@@ -156,32 +167,52 @@ class TrainPipeline:
         except Exception as e:
             raise CarException(e, sys) from e
 
+    # This method runs one stage and reports its start and duration to the stage callback
+    def _run_stage(self, stage: Callable, **kwargs: Any) -> Any:
+        stage_name = stage.__name__
+        if self.stage_callback is not None:
+            self.stage_callback(stage_name, "started", 0.0)
+
+        start_time = time.perf_counter()
+        result = stage(**kwargs)
+
+        if self.stage_callback is not None:
+            self.stage_callback(
+                stage_name, "completed", time.perf_counter() - start_time
+            )
+        return result
+
     # This method is used to start the training pipeline
     def run_pipeline(self) -> None:
         logger.info("Entered the run_pipeline method of TrainPipeline class")
         try:
-            data_ingestion_artifact = self.start_data_ingestion()
+            data_ingestion_artifact = self._run_stage(self.start_data_ingestion)
 
-            data_validation_artifact = self.start_data_validation(
-                data_ingestion_artifact=data_ingestion_artifact
+            data_validation_artifact = self._run_stage(
+                self.start_data_validation,
+                data_ingestion_artifact=data_ingestion_artifact,
             )
 
-            data_transformation_artifact = self.start_data_transformation(
-                data_ingestion_artifact=data_ingestion_artifact
+            data_transformation_artifact = self._run_stage(
+                self.start_data_transformation,
+                data_ingestion_artifact=data_ingestion_artifact,
             )
 
-            model_trainer_artifact = self.start_model_trainer(
-                data_transformation_artifact=data_transformation_artifact
+            model_trainer_artifact = self._run_stage(
+                self.start_model_trainer,
+                data_transformation_artifact=data_transformation_artifact,
             )
 
-            model_evaluation_artifact = self.start_model_evaluation(
+            model_evaluation_artifact = self._run_stage(
+                self.start_model_evaluation,
                 data_ingestion_artifact=data_ingestion_artifact,
                 model_trainer_artifact=model_trainer_artifact,
             )
             if not model_evaluation_artifact.is_model_accepted:
                 logger.info("Model not accepted")
                 return None
-            model_pusher_artifact = self.start_model_pusher(
+            model_pusher_artifact = self._run_stage(
+                self.start_model_pusher,
                 model_trainer_artifacts=model_trainer_artifact,
                 s3=self.s3_operations,
                 data_transformation_artifacts=data_transformation_artifact,
@@ -190,3 +221,35 @@ class TrainPipeline:
 
         except Exception as e:
             raise CarException(e, sys) from e
+
+
+def run_train_pipeline(
+    job_id: Optional[str] = None,
+    progress_queue: Any = None,
+    incremental: Optional[bool] = None,
+    full_refresh: Optional[bool] = None,
+) -> None:
+    """
+    Entry point used to run the training pipeline in a worker process.
+
+    Stage events are put on `progress_queue` as (job_id, stage, event, duration)
+    tuples so the serving process can report the job status. `incremental` and
+    `full_refresh` override the ingestion defaults for this run.
+    """
+    stage_callback = None
+    if progress_queue is not None:
+        stage_callback = lambda stage, event, duration: progress_queue.put(
+            (job_id, stage, event, duration)
+        )
+
+    try:
+        train_pipeline = TrainPipeline(
+            stage_callback=stage_callback,
+            incremental=incremental,
+            full_refresh=full_refresh,
+        )
+        train_pipeline.run_pipeline()
+
+    finally:
+        # Worker processes are reused, their connections are not kept idle between jobs
+        close_clients()
@@ -0,0 +1,355 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Dict, Optional, TextIO, Tuple
+from car_price.constant import (
+    TRAINING_JOB_HISTORY_SIZE,
+    TRAINING_JOB_POLL_INTERVAL,
+    TRAINING_LOCK_FILE,
+)
+from car_price.exception import CarException
+from car_price.utils.executors import (
+    get_training_executor,
+    mark_training_executor_broken,
+)
+from car_price.utils.metrics import REGISTRY
+
+try:
+    import fcntl
+except ImportError:
+    # Without fcntl (Windows) there is no pre-fork server, one process trains
+    fcntl = None
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+class TrainingJobRunningError(Exception):
+    """Raised when another process is training and its job cannot be read."""
+
+
+@dataclass
+class TrainingJob:
+    job_id: str
+    status: str = "pending"
+    current_stage: Optional[str] = None
+    stage_durations: Dict[str, float] = field(default_factory=dict)
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    # Ingestion options of the job, None keeps the environment default
+    incremental: Optional[bool] = None
+    full_refresh: Optional[bool] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class TrainingJobManager:
+    """
+    Runs the training pipeline as background jobs in the training process pool.
+
+    At most one job is active at a time; submitting while a job is running
+    returns the running job instead of starting a second grid search.
+
+    The workers of the pre-fork server each have a manager. An exclusive lock
+    on TRAINING_LOCK_FILE, holding the pid and job id, lets one process train
+    at a time, and the process running a job writes its status to a JSON file
+    next to the lock, so every worker can join and report it.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        history_size: int = TRAINING_JOB_HISTORY_SIZE,
+        lock_file_path: str = TRAINING_LOCK_FILE,
+    ):
+        self.history_size = history_size
+        self.lock_file_path = lock_file_path
+        self.job_dir = os.path.join(os.path.dirname(lock_file_path), "training_jobs")
+        self._lock_file: Optional[TextIO] = None
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._active_job_id: Optional[str] = None
+        self._lock = threading.Lock()
+        self._manager = None
+        self._progress_queue = None
+        self._listener: Optional[threading.Thread] = None
+
+    @classmethod
+    def get_instance(cls) -> "TrainingJobManager":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def _get_progress_queue(self):
+        if self._progress_queue is None:
+            # Stage events cross the process boundary through a managed queue
+            self._manager = multiprocessing.get_context("spawn").Manager()
+            self._progress_queue = self._manager.Queue()
+            self._listener = threading.Thread(
+                target=self._listen, name="training-job-progress", daemon=True
+            )
+            self._listener.start()
+        return self._progress_queue
+
+    def _get_job_file_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, f"{job_id}.json")
+
+    def _save_job(self, job: TrainingJob) -> None:
+        if fcntl is None:
+            return
+        # Replaced atomically, so readers in other workers never see half a file
+        os.makedirs(self.job_dir, exist_ok=True)
+        job_file_path = self._get_job_file_path(job.job_id)
+        tmp_file_path = f"{job_file_path}.{os.getpid()}.tmp"
+        with open(tmp_file_path, "w") as f:
+            json.dump(job.to_dict(), f)
+        os.replace(tmp_file_path, job_file_path)
+
+    def _load_job(self, job_id: str) -> Optional[TrainingJob]:
+        if fcntl is None or not JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        try:
+            with open(self._get_job_file_path(job_id)) as f:
+                return TrainingJob(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _get_lock_holder_job_id(self) -> Optional[str]:
+        try:
+            with open(self.lock_file_path) as f:
+                fields = f.read().split()
+        except OSError:
+            return None
+        return fields[1] if len(fields) == 2 else None
+
+    def _acquire_process_lock(self, job: TrainingJob) -> bool:
+        if fcntl is None:
+            return True
+        os.makedirs(os.path.dirname(self.lock_file_path), exist_ok=True)
+        lock_file = open(self.lock_file_path, "a+")
+        try:
+            # The kernel drops the lock if this process dies, no stale lock remains
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+
+        # The job file exists before other workers can read its id from the lock
+        self._save_job(job)
+        lock_file.truncate(0)
+        lock_file.write(f"{os.getpid()} {job.job_id}\n")
+        lock_file.flush()
+        self._lock_file = lock_file
+        return True
+
+    def _release_process_lock(self) -> None:
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _submit_pipeline(self, job: TrainingJob) -> Future:
+        # The training pipeline pulls in the Mongo, validation and model
+        # search dependencies, so it is only imported once a job is started
+        from car_price.pipeline.train_pipeline import run_train_pipeline
+
+        submit = lambda: get_training_executor().submit(
+            run_train_pipeline,
+            job.job_id,
+            self._get_progress_queue(),
+            job.incremental,
+            job.full_refresh,
+        )
+        try:
+            return submit()
+        except BrokenProcessPool:
+            # A worker of the pool died since the last job, the next pool is new
+            mark_training_executor_broken()
+            return submit()
+
+    def submit(
+        self, incremental: Optional[bool] = None, full_refresh: Optional[bool] = None
+    ) -> Tuple[TrainingJob, bool]:
+
+        """
+        Method Name :   submit
+
+        Description :   This method starts a training job, or joins the one already running in this or
+                        another worker process, whose ingestion options are kept. incremental and
+                        full_refresh override the ingestion defaults of a new job.
+
+        Output      :   Training job and whether a new job was created
+        """
+        logger.info("Entered submit method of TrainingJobManager class")
+        try:
+            with self._lock:
+                if self._active_job_id is not None:
+                    logger.info(f"Joining running training job {self._active_job_id}")
+                    return self._jobs[self._active_job_id], False
+
+                job = TrainingJob(
+                    job_id=uuid.uuid4().hex,
+                    incremental=incremental,
+                    full_refresh=full_refresh,
+                )
+                if not self._acquire_process_lock(job):
+                    running_job_id = self._get_lock_holder_job_id()
+                    running_job = (
+                        self._load_job(running_job_id)
+                        if running_job_id is not None
+                        else None
+                    )
+                    if running_job is None:
+                        raise TrainingJobRunningError(
+                            "A training job is starting in another worker process"
+                        )
+                    logger.info(
+                        f"Joining training job {running_job_id} of another worker"
+                    )
+                    return running_job, False
+                try:
+                    future = self._submit_pipeline(job)
+                except Exception:
+                    self._release_process_lock()
+                    raise
+                self._jobs[job.job_id] = job
+                self._futures[job.job_id] = future
+                self._active_job_id = job.job_id
+                self._trim_history()
+
+            future.add_done_callback(partial(self._on_done, job.job_id))
+            logger.info(f"Submitted training job {job.job_id}")
+            logger.info("Exited submit method of TrainingJobManager class")
+            return job, True
+
+        except TrainingJobRunningError:
+            raise
+
+        except Exception as e:
+            raise CarException(e, sys) from e
+
+    def get_job(self, job_id: str) -> Optional[TrainingJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        # Jobs of other worker processes are read from their job file
+        return job if job is not None else self._load_job(job_id)
+
+    async def wait(self, job_id: str) -> TrainingJob:
+        future = self._futures.get(job_id)
+        if future is None:
+            # Job of another worker process, polled until it is finished
+            job = self.get_job(job_id)
+            while job is not None and not job.is_finished:
+                await asyncio.sleep(TRAINING_JOB_POLL_INTERVAL)
+                job = self.get_job(job_id)
+            return job
+
+        try:
+            await asyncio.wrap_future(future)
+        except Exception:
+            # The failure is recorded on the job by _on_done
+            pass
+        return self._jobs[job_id]
+
+    def _trim_history(self) -> None:
+        while len(self._jobs) > self.history_size:
+            job_id, job = next(iter(self._jobs.items()))
+            if not job.is_finished:
+                break
+            del self._jobs[job_id]
+            self._futures.pop(job_id, None)
+            if fcntl is not None and os.path.exists(self._get_job_file_path(job_id)):
+                os.remove(self._get_job_file_path(job_id))
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                if self._active_job_id == job_id:
+                    self._active_job_id = None
+                    self._release_process_lock()
+                return
+
+            job.finished_at = time.time()
+            error = future.exception()
+            if isinstance(error, BrokenProcessPool):
+                # The worker was killed mid-job, e.g. by the OOM killer
+                mark_training_executor_broken()
+            if error is None:
+                job.status = "succeeded"
+                job.current_stage = None
+                logger.info(f"Training job {job_id} succeeded")
+            else:
+                job.status = "failed"
+                job.error = str(error)
+                logger.error(f"Training job {job_id} failed: {error}")
+
+            # The final status is written before another worker may start a job
+            self._save_job(job)
+            if self._active_job_id == job_id:
+                self._active_job_id = None
+                self._release_process_lock()
+
+            REGISTRY.counter(
+                "car_price_training_jobs_total",
+                "Finished training jobs by status",
+                status=job.status,
+            ).inc()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                event = self._progress_queue.get()
+            except (EOFError, OSError):
+                break
+            if event is None:
+                break
+
+            job_id, stage, event_type, duration = event
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                if event_type == "started" and not job.is_finished:
+                    if job.started_at is None:
+                        job.started_at = time.time()
+                    job.status = "running"
+                    job.current_stage = stage
+                elif event_type == "completed":
+                    job.stage_durations[stage] = duration
+                    REGISTRY.train_stage(stage).observe(duration)
+                self._save_job(job)
+
+    def shutdown(self) -> None:
+        if self._progress_queue is not None:
+            self._progress_queue.put(None)
+            self._listener.join(timeout=5)
+            self._manager.shutdown()
+            self._progress_queue = None
+            self._manager = None
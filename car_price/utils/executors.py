@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+from car_price.constant import INFERENCE_POOL_SIZE, TRAINING_POOL_SIZE
+
+# initializing logger
+logger = logging.getLogger(__name__)
+
+_inference_executor: Optional[ThreadPoolExecutor] = None
+_training_executor: Optional[ProcessPoolExecutor] = None
+# Set once a training worker died, the pool then rejects every submit
+_training_executor_broken = False
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> ThreadPoolExecutor:
+    """Bounded thread pool for blocking model inference."""
+    global _inference_executor
+    with _executor_lock:
+        if _inference_executor is None:
+            _inference_executor = ThreadPoolExecutor(
+                max_workers=INFERENCE_POOL_SIZE, thread_name_prefix="inference"
+            )
+            logger.info(f"Created inference pool with {INFERENCE_POOL_SIZE} threads")
+        return _inference_executor
+
+
+def get_training_executor() -> ProcessPoolExecutor:
+    """Process pool for training, so GridSearchCV never runs on a serving process."""
+    global _training_executor, _training_executor_broken
+    with _executor_lock:
+        if _training_executor is not None and _training_executor_broken:
+            logger.warning("Training pool is broken, replacing it")
+            _training_executor.shutdown(wait=False)
+            _training_executor = None
+        _training_executor_broken = False
+        if _training_executor is None:
+            # spawn avoids forking a process that already runs server threads
+            _training_executor = ProcessPoolExecutor(
+                max_workers=TRAINING_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Created training pool with {TRAINING_POOL_SIZE} processes")
+        return _training_executor
+
+
+def mark_training_executor_broken() -> None:
+    """Replaces the training pool on next use, after BrokenProcessPool was raised."""
+    global _training_executor_broken
+    with _executor_lock:
+        _training_executor_broken = True
+
+
+async def run_in_executor(
+    executor: Executor, func: Callable, *args: Any, **kwargs: Any
+) -> Any:
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+def shutdown_executors() -> None:
+    global _inference_executor, _training_executor
+    with _executor_lock:
+        if _inference_executor is not None:
+            _inference_executor.shutdown(wait=False)
+            _inference_executor = None
+        if _training_executor is not None:
+            _training_executor.shutdown(wait=False)
+            _training_executor = None
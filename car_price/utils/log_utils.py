@@ -0,0 +1,117 @@
+import atexit
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+# Loggers of the per-request prediction path, subject to sampling and rate limiting
+HOT_PATH_LOGGERS = (
+    "car_price.components.model_predictor",
+    "car_price.components.model_trainer",
+    "car_price.components.stream_scorer",
+)
+
+LOG_FORMAT = "[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s"
+
+_queue_handler: Optional[QueueHandler] = None
+_queue_listener: Optional[QueueListener] = None
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random `rate` share of the records below WARNING."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `rate` records per second for each message template
+    below WARNING, with bursts of up to `rate` records. The number of dropped
+    records is appended to the next record let through.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        # (logger name, message template) -> (tokens, last update, suppressed)
+        self._buckets: Dict[Tuple[str, str], Tuple[float, float, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at, suppressed = self._buckets.get(key, (self.rate, now, 0))
+            tokens = min(self.rate, tokens + (now - updated_at) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[key] = (tokens - 1, now, 0)
+
+        if suppressed > 0:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
+def _start_listener(handler: logging.Handler) -> None:
+    global _queue_listener
+    log_queue: "queue.Queue" = queue.Queue(-1)
+    _queue_handler.queue = log_queue
+    _queue_listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def stop_logging() -> None:
+    """Flushes the queued records and stops the writer thread."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def configure_logging(
+    log_file_path: str,
+    level: str = "DEBUG",
+    sample_rate: float = 1.0,
+    rate_limit: float = 0,
+) -> None:
+    """
+    Routes every record through a queue to a background thread that writes
+    the log file, so logging never blocks the caller on disk I/O.
+    """
+    global _queue_handler
+    if _queue_handler is not None:
+        return
+
+    file_handler = logging.FileHandler(log_file_path)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    _queue_handler = QueueHandler(queue.Queue(-1))
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(_queue_handler)
+    _start_listener(file_handler)
+    atexit.register(stop_logging)
+
+    # The writer thread does not survive a fork, pre-forked workers start their own
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=lambda: _start_listener(file_handler))
+
+    for logger_name in HOT_PATH_LOGGERS:
+        hot_path_logger = logging.getLogger(logger_name)
+        if sample_rate < 1:
+            hot_path_logger.addFilter(SamplingFilter(sample_rate))
+        if rate_limit > 0:
+            hot_path_logger.addFilter(RateLimitFilter(rate_limit))
@@ -2,14 +2,10 @@ import shutil
 import sys
 from typing import Dict, Tuple, List
 import dill
-import xgboost
 import numpy as np
 import pandas as pd
 import yaml
 from pandas import DataFrame
-from sklearn.metrics import r2_score
-from sklearn.model_selection import GridSearchCV
-from sklearn.utils import all_estimators
 from yaml import safe_dump
 from car_price.constant import *
 from car_price.exception import CarException
@@ -85,8 +81,10 @@ class MainUtils:
     def get_model_score(test_y: DataFrame, preds: DataFrame) -> float:
         logger.info("Entered the get_model_score method of MainUtils class")
         try:
+            from sklearn.metrics import r2_score
+
             model_score = r2_score(test_y, preds)
-            logger.info("Model score is {}".format(model_score))
+            logger.info("Model score is %s", model_score)
             logger.info("Exited the get_model_score method of MainUtils class")
             return model_score
 
@@ -97,9 +95,14 @@ class MainUtils:
     def get_base_model(model_name: str) -> object:
         logger.info("Entered the get_base_model method of MainUtils class")
         try:
+            # Training-only imports, kept out of the serving import path
             if model_name.lower().startswith("xgb") is True:
+                import xgboost
+
                 model = xgboost.__dict__[model_name]()
             else:
+                from sklearn.utils import all_estimators
+
                 model_idx = [model[0] for model in all_estimators()].index(model_name)
                 model = all_estimators().__getitem__(model_idx)[1]()
             logger.info("Exited the get_base_model method of MainUtils class")
@@ -113,6 +116,8 @@ class MainUtils:
     ) -> Dict:
         logger.info("Entered the get_model_params method of MainUtils class")
         try:
+            from sklearn.model_selection import GridSearchCV
+
             VERBOSE = 3
             CV = 2
             N_JOBS = -1
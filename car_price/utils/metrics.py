@@ -0,0 +1,231 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+TRAINING_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+PREDICT_STAGE_METRIC = "car_price_predict_stage_seconds"
+TRAIN_STAGE_METRIC = "car_price_train_stage_seconds"
+
+# (name, type, description, labels, value) samples reported by collectors
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if len(labels) == 0:
+        return ""
+    pairs = []
+    for key, value in sorted(labels.items()):
+        value = (
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.labels = labels if labels is not None else {}
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+            self._count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start_time)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative = 0
+        buckets = {}
+        for upper_bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            buckets[str(upper_bound)] = cumulative
+        buckets["+Inf"] = count
+
+        return {"count": count, "sum": total, "buckets": buckets}
+
+    def render(self) -> List[str]:
+        stats = self.get_stats()
+        lines = []
+        for upper_bound, count in stats["buckets"].items():
+            labels = _format_labels({**self.labels, "le": upper_bound})
+            lines.append(f"{self.name}_bucket{labels} {count}")
+        labels = _format_labels(self.labels)
+        lines.append(f"{self.name}_sum{labels} {_format_value(stats['sum'])}")
+        lines.append(f"{self.name}_count{labels} {stats['count']}")
+        return lines
+
+
+class Counter:
+    def __init__(
+        self, name: str, description: str, labels: Optional[Dict[str, str]] = None
+    ):
+        self.name = name
+        self.description = description
+        self.labels = labels if labels is not None else {}
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels)} {_format_value(self._value)}"
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[Tuple, object] = {}
+        self._collectors: List[Callable[[], List[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, key: Tuple, factory: Callable[[], object]) -> object:
+        with self._lock:
+            if key not in self._metrics:
+                self._metrics[key] = factory()
+            return self._metrics[key]
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        **labels: str,
+    ) -> Histogram:
+        key = ("histogram", name, tuple(sorted(labels.items())))
+        return self._get_or_create(
+            key, lambda: Histogram(name, description, buckets, labels)
+        )
+
+    def counter(self, name: str, description: str, **labels: str) -> Counter:
+        key = ("counter", name, tuple(sorted(labels.items())))
+        return self._get_or_create(key, lambda: Counter(name, description, labels))
+
+    def predict_stage(self, stage: str) -> Histogram:
+        return self.histogram(
+            PREDICT_STAGE_METRIC, "Latency of each prediction stage", stage=stage
+        )
+
+    def train_stage(self, stage: str) -> Histogram:
+        return self.histogram(
+            TRAIN_STAGE_METRIC,
+            "Duration of each training pipeline stage",
+            TRAINING_BUCKETS,
+            stage=stage,
+        )
+
+    def register_collector(self, collector: Callable[[], List[Sample]]) -> None:
+        """Registers a callback reporting gauges and counters kept by other components."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        stats = {}
+        for metric in metrics:
+            key = metric.name + _format_labels(metric.labels)
+            if isinstance(metric, Histogram):
+                stats[key] = metric.get_stats()
+            else:
+                stats[key] = metric.value
+        return stats
+
+    def render_prometheus(self) -> str:
+
+        """
+        Method Name :   render_prometheus
+
+        Description :   This method renders every metric in the Prometheus text exposition format.
+
+        Output      :   Metrics text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        # metric name -> (type, description, sample lines)
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+        for metric in metrics:
+            metric_type = "histogram" if isinstance(metric, Histogram) else "counter"
+            family = families.setdefault(
+                metric.name, (metric_type, metric.description, [])
+            )
+            family[2].extend(metric.render())
+
+        for collector in collectors:
+            for name, metric_type, description, labels, value in collector():
+                family = families.setdefault(name, (metric_type, description, []))
+                family[2].append(
+                    f"{name}{_format_labels(labels)} {_format_value(value)}"
+                )
+
+        lines = []
+        for name, (metric_type, description, samples) in families.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by the serving components
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,51 @@
+import os
+from typing import Dict, Iterable, Optional
+
+_SMAPS_FIELDS = {
+    "Rss": "rss_bytes",
+    "Pss": "pss_bytes",
+    "Shared_Clean": "shared_clean_bytes",
+    "Shared_Dirty": "shared_dirty_bytes",
+    "Private_Clean": "private_clean_bytes",
+    "Private_Dirty": "private_dirty_bytes",
+}
+
+
+def get_process_memory(pid: Optional[int] = None) -> Dict[str, int]:
+    """
+    Reads the memory use of a process from /proc.
+
+    PSS splits every shared page between the processes mapping it, so summing
+    it over a group of forked workers gives their real combined footprint,
+    while summing RSS counts the copy-on-write pages once per worker.
+    """
+    pid = os.getpid() if pid is None else pid
+    memory = {"pid": pid}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                field = parts[0].rstrip(":")
+                if field in _SMAPS_FIELDS:
+                    memory[_SMAPS_FIELDS[field]] = int(parts[1]) * 1024
+
+    except OSError:
+        # smaps_rollup needs Linux 4.14, fall back to the resident set size
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        memory["rss_bytes"] = int(line.split()[1]) * 1024
+
+        except OSError:
+            pass
+    return memory
+
+
+def get_fleet_memory(pids: Iterable[int]) -> Dict:
+    processes = [get_process_memory(pid) for pid in pids]
+    return {
+        "processes": processes,
+        "total_rss_bytes": sum(p.get("rss_bytes", 0) for p in processes),
+        "total_pss_bytes": sum(p.get("pss_bytes", 0) for p in processes),
+    }
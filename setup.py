@@ -7,4 +7,49 @@ setup(
     author_email="cloud@ineuron.ai",
     packages=find_packages(),
     install_requires=[],
+    extras_require={
+        # Everything needed to load the model and run app.py
+        "serving": [
+            "boto3",
+            "category-encoders",
+            "dill",
+            "fastapi",
+            "from-root",
+            "Jinja2",
+            "pandas",
+            "python-multipart",
+            "PyYAML",
+            "scikit-learn",
+            "uvicorn",
+            "xgboost",
+        ],
+        # Arrow IPC scoring of POST /predict/arrow
+        "arrow": ["pyarrow"],
+        # Load generator of car-price-load-test
+        "loadtest": ["httpx"],
+        # Unit tests under tests/
+        "test": ["pytest"],
+        # Additionally needed by the training pipeline
+        "training": [
+            "boto3",
+            "category-encoders",
+            "dill",
+            "evidently",
+            "from-root",
+            "pandas",
+            # Parquet data snapshot of incremental ingestion
+            "pyarrow",
+            "pymongo[srv]",
+            "PyYAML",
+            "scikit-learn",
+            "xgboost",
+        ],
+    },
+    entry_points={
+        "console_scripts": [
+            "car-price-batch-predict=car_price.pipeline.batch_prediction:main",
+            "car-price-serve=car_price.pipeline.prefork_server:main",
+            "car-price-load-test=car_price.pipeline.load_test:main",
+        ],
+    },
 )
@@ -0,0 +1,95 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import AdmissionControlMiddleware
+from car_price.components.admission_controller import AdmissionController
+
+
+def test_acquire_sheds_when_queue_is_full():
+    async def run():
+        controller = AdmissionController(
+            max_concurrency=1, max_queue_depth=0, timeout=5, retry_after=1
+        )
+        assert await controller.acquire(controller.get_deadline()) is None
+        assert await controller.acquire(controller.get_deadline()) == "queue_full"
+        controller.release()
+        assert await controller.acquire(controller.get_deadline()) is None
+
+    asyncio.run(run())
+
+
+def test_acquire_sheds_waiter_past_its_deadline():
+    async def run():
+        controller = AdmissionController(
+            max_concurrency=1, max_queue_depth=1, timeout=0.05, retry_after=1
+        )
+        assert await controller.acquire(controller.get_deadline()) is None
+        assert await controller.acquire(controller.get_deadline()) == "queue_timeout"
+        assert controller.get_stats()["in_flight"] == 1
+
+    asyncio.run(run())
+
+
+def test_release_hands_slot_to_oldest_waiter():
+    async def run():
+        controller = AdmissionController(
+            max_concurrency=1, max_queue_depth=2, timeout=5, retry_after=1
+        )
+        await controller.acquire(controller.get_deadline())
+        first = asyncio.ensure_future(controller.acquire(controller.get_deadline()))
+        second = asyncio.ensure_future(controller.acquire(controller.get_deadline()))
+        await asyncio.sleep(0)
+
+        controller.release()
+        assert await first is None
+        assert not second.done()
+        controller.release()
+        assert await second is None
+        assert controller.get_stats()["in_flight"] == 1
+
+    asyncio.run(run())
+
+
+def make_app(controller: AdmissionController, delay: float) -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(AdmissionControlMiddleware)
+    test_app.state.admission_controller = controller
+
+    @test_app.post("/predict")
+    async def predict():
+        await asyncio.sleep(delay)
+        return {"price": 1.0}
+
+    @test_app.get("/predict")
+    async def form():
+        return {"form": True}
+
+    return test_app
+
+
+def test_middleware_answers_503_with_retry_after_when_shed():
+    controller = AdmissionController(
+        max_concurrency=1, max_queue_depth=0, timeout=5, retry_after=7
+    )
+    with TestClient(make_app(controller, delay=0)) as client:
+        assert client.post("/predict").status_code == 200
+
+        # A request holding the only slot makes the next one shed at once
+        client.portal.call(controller.acquire, controller.get_deadline())
+        response = client.post("/predict")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+
+        # Routes outside the prediction routes are never shed
+        assert client.get("/predict").status_code == 200
+
+
+def test_middleware_answers_504_past_the_deadline():
+    controller = AdmissionController(
+        max_concurrency=1, max_queue_depth=0, timeout=0.05, retry_after=1
+    )
+    with TestClient(make_app(controller, delay=1)) as client:
+        response = client.post("/predict")
+
+    assert response.status_code == 504
+    assert controller.get_stats()["in_flight"] == 0
@@ -0,0 +1,121 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from bson import ObjectId
+from car_price.components.data_ingestion import DataIngestion
+from car_price.components.data_snapshot import DataSnapshot
+from car_price.entity.config_entity import DataIngestionConfig
+
+pytest.importorskip("pyarrow")
+
+
+def test_get_query_is_exclusive_for_id_and_inclusive_for_timestamps(tmp_path):
+    watermark = ObjectId()
+    id_snapshot = DataSnapshot(str(tmp_path), "db", "car", "_id")
+    updated_snapshot = DataSnapshot(str(tmp_path), "db", "car", "updated_at")
+
+    assert id_snapshot.get_query(None) == {}
+    assert id_snapshot.get_query(watermark) == {"_id": {"$gt": watermark}}
+    assert updated_snapshot.get_query(watermark) == {"updated_at": {"$gte": watermark}}
+
+
+def test_get_watermark_ignores_missing_values_and_never_goes_back():
+    assert DataSnapshot.get_watermark(pd.Series([3, None, 5]), None) == 5
+    assert DataSnapshot.get_watermark(pd.Series([3.0, float("nan")]), 4.0) == 4.0
+    assert DataSnapshot.get_watermark(pd.Series([], dtype=object), None) is None
+
+
+def test_merge_replaces_refetched_rows_and_appends_new_ones():
+    snapshot_df = pd.DataFrame({"_id": ["a", "b"], "price": [1, 2]})
+    new_df = pd.DataFrame({"_id": ["b", "c"], "price": [20, 30]})
+
+    merged = DataSnapshot.merge(snapshot_df, new_df)
+
+    assert sorted(zip(merged["_id"], merged["price"])) == [
+        ("a", 1),
+        ("b", 20),
+        ("c", 30),
+    ]
+
+
+@pytest.mark.parametrize("watermark", [ObjectId(), datetime(2024, 5, 1, 12, 30), 42])
+def test_save_and_load_round_trip(tmp_path, watermark):
+    data_snapshot = DataSnapshot(str(tmp_path), "db", "car", "_id")
+    df = pd.DataFrame({"_id": ["a", "b"], "price": [1, 2]})
+
+    data_snapshot.save(df, watermark)
+    loaded_df, loaded_watermark = data_snapshot.load(["price", "_id"])
+
+    pd.testing.assert_frame_equal(loaded_df, df, check_dtype=False)
+    assert loaded_watermark == watermark
+
+
+def test_load_ignores_snapshot_of_other_columns(tmp_path):
+    data_snapshot = DataSnapshot(str(tmp_path), "db", "car", "_id")
+    data_snapshot.save(pd.DataFrame({"_id": ["a"], "price": [1]}), ObjectId())
+
+    assert data_snapshot.load(["price", "seats", "_id"]) == (None, None)
+    other_field = DataSnapshot(str(tmp_path), "db", "car", "updated_at")
+    assert other_field.load(["price", "_id"]) == (None, None)
+
+
+class FakeMongoOperation:
+    """Serves the documents past the _id watermark of the query."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    def get_collection_as_dataframe(
+        self, db_name, collection_name, column_types, batch_size, query, partitions
+    ):
+        self.queries.append(query)
+        documents = self.documents
+        if query:
+            documents = [d for d in documents if d["_id"] > query["_id"]["$gt"]]
+        return pd.DataFrame(documents, columns=list(column_types))
+
+
+def make_documents(n_documents, columns):
+    return [
+        {
+            "_id": ObjectId(),
+            **{column: idx for column in columns},
+            "car_name": f"car {idx}",
+        }
+        for idx in range(n_documents)
+    ]
+
+
+def test_incremental_ingestion_only_fetches_new_documents(tmp_path):
+    config = DataIngestionConfig(incremental=True, full_refresh=False)
+    config.SNAPSHOT_DIR = str(tmp_path)
+    documents = make_documents(5, config.COLUMN_TYPES)
+    mongo_op = FakeMongoOperation(documents[:3])
+    data_ingestion = DataIngestion(config, mongo_op)
+
+    first_df = data_ingestion.get_incremental_data_from_mongodb()
+    mongo_op.documents = documents
+    second_df = data_ingestion.get_incremental_data_from_mongodb()
+
+    assert mongo_op.queries[0] == {}
+    assert mongo_op.queries[1] == {"_id": {"$gt": documents[2]["_id"]}}
+    assert len(first_df) == 3
+    assert sorted(second_df["car_name"]) == [f"car {idx}" for idx in range(5)]
+    assert "_id" not in second_df.columns
+
+
+def test_full_refresh_rereads_the_collection(tmp_path):
+    config = DataIngestionConfig(incremental=True, full_refresh=False)
+    config.SNAPSHOT_DIR = str(tmp_path)
+    documents = make_documents(3, config.COLUMN_TYPES)
+    mongo_op = FakeMongoOperation(documents)
+    DataIngestion(config, mongo_op).get_incremental_data_from_mongodb()
+
+    # A document deleted from the collection only leaves the snapshot on a full refresh
+    mongo_op.documents = documents[1:]
+    config.FULL_REFRESH = True
+    df = DataIngestion(config, mongo_op).get_incremental_data_from_mongodb()
+
+    assert mongo_op.queries[-1] == {}
+    assert sorted(df["car_name"]) == ["car 1", "car 2"]
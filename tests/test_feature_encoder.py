@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+from category_encoders.binary import BinaryEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from car_price.components.feature_encoder import CompiledFeatureEncoder
+
+ONEHOT_COLUMNS = ["seller_type", "fuel_type", "transmission_type"]
+BINARY_COLUMNS = ["car_name"]
+NUMERICAL_COLUMNS = ["vehicle_age", "km_driven", "mileage"]
+
+
+@pytest.fixture
+def car_df() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n_rows = 200
+    return pd.DataFrame(
+        {
+            "car_name": rng.choice(
+                ["Maruti Alto", "Hyundai i20", "Honda City"], n_rows
+            ),
+            "seller_type": rng.choice(["Dealer", "Individual"], n_rows),
+            "fuel_type": rng.choice(["Petrol", "Diesel", "CNG"], n_rows),
+            "transmission_type": rng.choice(["Manual", "Automatic"], n_rows),
+            "vehicle_age": rng.integers(0, 20, n_rows),
+            "km_driven": rng.integers(0, 200000, n_rows),
+            "mileage": rng.uniform(5, 30, n_rows),
+        }
+    )
+
+
+@pytest.fixture
+def preprocessor(car_df: pd.DataFrame) -> ColumnTransformer:
+    # Built like DataTransformation builds the served preprocessor
+    return ColumnTransformer(
+        [
+            ("OneHotEncoder", OneHotEncoder(handle_unknown="ignore"), ONEHOT_COLUMNS),
+            ("BinaryEncoder", BinaryEncoder(), BINARY_COLUMNS),
+            ("StandardScaler", StandardScaler(), NUMERICAL_COLUMNS),
+        ]
+    ).fit(car_df)
+
+
+def to_dense(values) -> np.ndarray:
+    if hasattr(values, "toarray"):
+        values = values.toarray()
+    return np.asarray(values, dtype=np.float64)
+
+
+def test_transform_matches_preprocessor(car_df, preprocessor):
+    encoder = CompiledFeatureEncoder(preprocessor)
+
+    np.testing.assert_array_equal(
+        encoder.transform(car_df), to_dense(preprocessor.transform(car_df))
+    )
+
+
+def test_transform_record_matches_preprocessor(car_df, preprocessor):
+    encoder = CompiledFeatureEncoder(preprocessor)
+    expected = to_dense(preprocessor.transform(car_df))
+
+    for idx, record in enumerate(car_df.head(20).to_dict("records")):
+        np.testing.assert_array_equal(
+            encoder.transform_record(record)[0], expected[idx]
+        )
+
+
+def test_unknown_categories_match_preprocessor(car_df, preprocessor):
+    encoder = CompiledFeatureEncoder(preprocessor)
+    unknown_df = car_df.head(3).copy()
+    unknown_df["car_name"] = "Unknown Car"
+    unknown_df["fuel_type"] = "Electric"
+
+    np.testing.assert_array_equal(
+        encoder.transform(unknown_df), to_dense(preprocessor.transform(unknown_df))
+    )
+
+
+def test_build_returns_encoder_only_when_it_matches(car_df, preprocessor):
+    assert CompiledFeatureEncoder.build(preprocessor, car_df) is not None
+
+    unsupported = ColumnTransformer(
+        [("OneHotEncoder", OneHotEncoder(drop="first"), ONEHOT_COLUMNS)]
+    ).fit(car_df)
+    assert CompiledFeatureEncoder.build(unsupported, car_df) is None
+
+
+def test_get_learned_categories(preprocessor):
+    categories = CompiledFeatureEncoder.get_learned_categories(preprocessor)
+
+    assert sorted(categories["fuel_type"]) == ["CNG", "Diesel", "Petrol"]
+    assert sorted(categories["car_name"]) == [
+        "Honda City",
+        "Hyundai i20",
+        "Maruti Alto",
+    ]
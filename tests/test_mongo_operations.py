@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from car_price.configuration.mongo_operations import MongoDBOperation
+
+COLUMN_TYPES = {"car_name": "category", "vehicle_age": "int", "mileage": "float"}
+
+
+def test_cursor_to_dataframe_types_columns():
+    documents = [
+        {"car_name": "Maruti Alto", "vehicle_age": 5, "mileage": 18.5, "brand": "x"},
+        {"car_name": "Honda City", "vehicle_age": 3, "mileage": 17},
+        {"car_name": "Hyundai i20", "vehicle_age": 9, "mileage": 20.1},
+    ]
+
+    df = MongoDBOperation.cursor_to_dataframe(documents, COLUMN_TYPES, batch_size=2)
+
+    assert list(df.columns) == list(COLUMN_TYPES)
+    assert df["vehicle_age"].dtype == np.int64
+    assert df["mileage"].dtype == np.float64
+    assert df["car_name"].tolist() == ["Maruti Alto", "Honda City", "Hyundai i20"]
+    assert df["vehicle_age"].tolist() == [5, 3, 9]
+
+
+def test_cursor_to_dataframe_keeps_missing_values():
+    documents = [
+        {"car_name": "Maruti Alto", "vehicle_age": 5, "mileage": "18.5"},
+        {"vehicle_age": None, "mileage": "n/a"},
+    ]
+
+    df = MongoDBOperation.cursor_to_dataframe(documents, COLUMN_TYPES, batch_size=10)
+
+    # An int column with missing values stays float, like pandas would read it
+    assert df["vehicle_age"].dtype == np.float64
+    assert df["vehicle_age"].isna().tolist() == [False, True]
+    assert df["mileage"].tolist()[0] == 18.5
+    assert np.isnan(df["mileage"].tolist()[1])
+    assert df["car_name"].tolist()[0] == "Maruti Alto"
+    assert df["car_name"].isna().tolist() == [False, True]
+
+
+def test_cursor_to_dataframe_of_empty_cursor():
+    df = MongoDBOperation.cursor_to_dataframe(iter([]), COLUMN_TYPES, batch_size=2)
+
+    assert len(df) == 0
+    assert list(df.columns) == list(COLUMN_TYPES)
+    assert df["mileage"].dtype == np.float64
+
+
+def test_dataframe_to_records_converts_missing_values_to_none():
+    df = pd.DataFrame(
+        {
+            "car_name": ["Maruti Alto", None],
+            "vehicle_age": [5, 3],
+            "mileage": [18.5, np.nan],
+        }
+    )
+
+    records = MongoDBOperation.dataframe_to_records(df)
+
+    assert records == [
+        {"car_name": "Maruti Alto", "vehicle_age": 5, "mileage": 18.5},
+        {"car_name": None, "vehicle_age": 3, "mileage": None},
+    ]
+    assert type(records[0]["vehicle_age"]) is int
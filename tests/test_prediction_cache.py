@@ -0,0 +1,74 @@
+import pytest
+from car_price.components import prediction_cache
+from car_price.components.prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(prediction_cache.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def test_get_returns_cached_value(clock):
+    cache = PredictionCache(max_size=10, ttl=60)
+    cache.put(("a",), 1.5, "v1")
+
+    assert cache.get(("a",), "v1") == 1.5
+    assert cache.get(("b",), "v1") is None
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(max_size=10, ttl=60)
+    cache.put(("a",), 1.5, "v1")
+
+    clock.now += 59
+    assert cache.get(("a",), "v1") == 1.5
+    clock.now += 2
+    assert cache.get(("a",), "v1") is None
+    assert cache.get_stats()["expirations"] == 1
+    assert cache.get_stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = PredictionCache(max_size=2, ttl=60)
+    cache.put(("a",), 1.0, "v1")
+    cache.put(("b",), 2.0, "v1")
+    # Reading a makes b the least recently used entry
+    assert cache.get(("a",), "v1") == 1.0
+    cache.put(("c",), 3.0, "v1")
+
+    assert cache.get(("b",), "v1") is None
+    assert cache.get(("a",), "v1") == 1.0
+    assert cache.get(("c",), "v1") == 3.0
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_put_replaces_entry_and_refreshes_ttl(clock):
+    cache = PredictionCache(max_size=2, ttl=60)
+    cache.put(("a",), 1.0, "v1")
+    clock.now += 50
+    cache.put(("a",), 2.0, "v1")
+    clock.now += 50
+
+    assert cache.get(("a",), "v1") == 2.0
+    assert cache.get_stats()["size"] == 1
+
+
+def test_model_version_change_clears_cache(clock):
+    cache = PredictionCache(max_size=10, ttl=60)
+    cache.put(("a",), 1.0, "v1")
+
+    assert cache.get(("a",), "v2") is None
+    assert cache.get_stats()["invalidations"] == 1
+    assert cache.get_stats()["memory_bytes"] == 0